@@ -1,16 +1,37 @@
-import threading
-import winsound
+from time import perf_counter
+
+# Início da contagem do tempo de inicialização
+startup = perf_counter()
+
+import asyncio
 from functools import partial
-from time import sleep
+from time import monotonic
 
-import keyboard
-import numpy as np
-import pythoncom
 import speech_recognition as sr
-import win32com.client as wincom
+from backends import create_backends
+from capture import CaptureStream, microphone_reader
+from clock import GameClock
+from commands import Command, dispatcher, interpret
 from draft_commands import *
 from load import *
 from log import *
+from prefetch import prefetch
+from recognizer import create_recognizer, transcribe
+from registry import registry
+from resolver import Resolver
+from runtime import Runtime, hotkey_source, stdin_source
+from scheduler import Scheduler, cooldown
+from tracing import record, span
+
+
+# Som, voz e atalho do sistema atual (database.yaml: backend), criados no início da execução
+backends = None
+
+# Inimigos consultados na seleção de campeões (role -> campeão)
+enemies = {}
+
+# Relógio da partida (database.yaml: game_clock), utilizado para conferir as notificações
+game_clock = None
 
 
 def idle_trigger(r: sr.Recognizer) -> bool | None:  # Todo: Remover
@@ -46,86 +67,55 @@ def idle_trigger(r: sr.Recognizer) -> bool | None:  # Todo: Remover
         return
 
 
-def button_trigger(event, r: sr.Recognizer | None = None) -> None:
-    if event.name == '=':
-        command_listener(r, database, model, vectorizer)
-        event.name = ''
-
-
-def command_listener(r: sr.Recognizer, database: dict, model, vectorizer) -> None:
+def listen_command(issued: float, stream: CaptureStream, recognizer, resolver: Resolver, database: dict) -> str | None:
     """
-    Interpreta os comandos fornecidos, através do modelo de IA e executa tais comandos.
+    Captura um comando pelo microfone e o converte em texto.
+
+    O áudio vem da captura contínua, a partir de pouco antes do atalho, sem o
+    trecho em que o som de aviso foi reproduzido, e a fala é delimitada pelo
+    detector de voz. Com reconhecimento offline, a
+    captura é encerrada assim que uma hipótese parcial for um comando completo
+    reconhecido pelo resolvedor.
     
     Parâmetros:
     -----------
-    r: sr.Recognizer
-        Objeto de reconhecimento de fala
+    issued: float
+        Instante (relógio monotônico) do pressionamento do atalho
+    stream: CaptureStream
+        Captura contínua do microfone
+    recognizer: GoogleRecognizer | VoskRecognizer
+        Reconhecedor de fala
+    resolver: Resolver
+        Interpretador determinístico
     database: dict
         Banco de dados do algoritmo
-    model:
-        Modelo de IA
-    vectorizer:
-        Vetorizador de palavras
     
     Retorna:
     -------
-    None
+    str: texto reconhecido
+    None: se nenhum comando foi reconhecido
     """
 
-    try:
-        with sr.Microphone() as source:
-            logger.info('Aguardando comando...')
-            winsound.PlaySound(
-                'assets\\sounds\\listening.wav', winsound.SND_NOSTOP)
-            audio = r.listen(source, timeout=8)
+    def complete(text: str) -> bool:
+        resolution = resolver.resolve(text)
+        return resolution.label is not None and resolution.confidence >= database['resolver_threshold']
 
-        audio_to_text = r.recognize_google(audio, language="pt-BR")
-        audio_to_text = audio_to_text.lower()
-        logger.info(f'Commando: {audio_to_text}')
-        command = vectorizer.transform(
-            [audio_to_text]).toarray().astype(np.int8)
-        command = model.predict(command)[0]
-
-        # ─── Funcionalidade: Counters ─────────────────────────────────
-        # Instruções: o comando deve conter os seguintes parâmetros:
-        #   - "counters"
-        #   - NOME DO CAMPEÃO
-        #   - ROLE
-
-        if 'counters' in command:
-            winsound.PlaySound('assets\\sounds\\success.wav',
-                               winsound.SND_NOSTOP)
-            command = command.split(' ')
-            logger.info('Buscando counters para {} {}'.format(
-                command[1], command[2]))  # Todo: suporte para inglês
-            counters(' '.join(command[1:3]), display=True)
-
-        # ─── Funcionalidade: Draft ────────────────────────
-        # Instruções: o comando deve conter os seguintes parâmetros:
-        #   - "draft"
-        #   - NOME DO CAMPEÃO
-        #   - ROLE
-        if 'draft' in command:
-            winsound.PlaySound('assets\\sounds\\success.wav',
-                               winsound.SND_NOSTOP)
-            command = command.split(' ')
-            logger.info('Buscando draft para {} {}'.format(
-                command[1], command[2]))  # Todo: suporte para inglês
-            draft(' '.join(command[1:3]))
-
-        # ─── Funcionalidade: Cooldown De Spell ────────────────────────
-        # Instruções: o comando deve conter os seguintes parâmetros:
-        #   - SPELL
-        #   - ROLE
-        if 'spell' in command:
-            winsound.PlaySound('assets\\sounds\\success.wav',
-                               winsound.SND_NOSTOP)
-            command = command.split(' ')
-            threading.Thread(target=spell_notification, args=(
-                command[1], command[2], database, )).start()
-            # Todo: suporte para inglês
-            logger.info(
-                f'Notificação de {command[1]} do {command[2]} agendada. Você será notificado {database["delay"]}s antes da spell estar disponível.')
+    try:
+        logger.info('Aguardando comando...')
+        cue = monotonic()
+        backends.cue.play('listening')
+        mute = (cue, monotonic())
+        if recognizer.streaming:
+            text = transcribe(recognizer, stream.frames(issued, mute=mute), complete)
+        else:
+            audio = stream.listen(issued, mute=mute)
+            with span('recognize'):
+                text = recognizer.recognize(audio)
+        stream.timings['transcript'] = monotonic() - issued
+        logger.info(f'Captura: {stream.report()}')
+        record('capture', stream.timings['transcript'],
+               **{f'{stage}_ms': round(seconds * 1e3, 1) for stage, seconds in stream.timings.items()})
+        return text
 
     except sr.UnknownValueError:
         # Todo: suporte para inglês
@@ -140,35 +130,134 @@ def command_listener(r: sr.Recognizer, database: dict, model, vectorizer) -> Non
         #Todo: Som de erro
 
 
-def spell_notification(spell: str, role: str, database: dict) -> None:
+def execute_command(audio_to_text: str, issued: float, database: dict, classifier, resolver: Resolver) -> None:
     """
-    Notifica o fim do tempo de recarga de uma spell.
+    Interpreta um comando, através do resolvedor ou do modelo de IA, e o executa em segundo plano.
     
     Parâmetros:
     -----------
-    spell: str
-        Nome do spell
-    role: str
-        Nome do role
+    audio_to_text: str
+        Comando reconhecido
+    issued: float
+        Instante (relógio monotônico) em que o comando foi solicitado
     database: dict
-        Banco de dados
+        Banco de dados do algoritmo
+    classifier: Classifier
+        Modelo de IA
+    resolver: Resolver
+        Interpretador determinístico, consultado antes do modelo
     
     Retorna:
     -------
     None
     """
 
-    pythoncom.CoInitialize()
-    tts = wincom.Dispatch("SAPI.SpVoice")
+    logger.info(f'Commando: {audio_to_text} (capturado em {monotonic() - issued:.2f}s)')
+
+    # Interpretação determinística; o modelo é utilizado apenas em caso de baixa confiança
+    command = interpret(audio_to_text, resolver, classifier,
+                        database['resolver_threshold'], issued)
+    confidence = 'modelo' if command.confidence is None else f'{command.confidence:.2f}'
+    logger.info(f'Comando interpretado: {command.intent} {command.champion or command.spell} '
+                f'{command.role} (confiança: {confidence})')
+
+    if command.intent in dispatcher.handlers:
+        backends.cue.play('success')
+    dispatcher.dispatch(command, database)
+
+
+# ─── Funcionalidade: Counters ─────────────────────────────────────────────────
+# Instruções: o comando deve conter os seguintes parâmetros:
+#   - "counters"
+#   - NOME DO CAMPEÃO
+#   - ROLE
+
+
+@dispatcher.register('counters')
+def counters_handler(command: Command, database: dict) -> None:
+    logger.info(f'Buscando counters para {command.champion} {command.role}')  # Todo: suporte para inglês
+    counters(command.champion, command.role, display=True)
+    enemies[command.role] = command.champion
+    cache.log_stats()
 
-    timer = database['spells'][spell]
-    sleep(timer - database['delay'])
-    # Todo: suporte para inglês
-    notification = f'{spell} do {role} estará disponível em breve.'
-    logger.info(notification)
-    tts.Speak(notification)
 
-    del tts
+# Variação: "counters time" combina os counters de todos os inimigos
+# informados até o momento
+@dispatcher.register('counters_team')
+def counters_team_handler(command: Command, database: dict) -> None:
+    if not enemies:
+        return counters_handler(command, database)
+    logger.info('Buscando counters para o time inimigo: {}'.format(
+        ', '.join(f'{champion} {role}' for role, champion in enemies.items())))
+    counters_batch([(champion, role) for role, champion in enemies.items()],
+                   display=True)
+    cache.log_stats()
+
+
+# ─── Funcionalidade: Draft ────────────────────────────────────────────────────
+# Instruções: o comando deve conter os seguintes parâmetros:
+#   - "draft"
+#   - NOME DO CAMPEÃO
+#   - ROLE
+
+
+@dispatcher.register('draft')
+def draft_handler(command: Command, database: dict) -> None:
+    logger.info(f'Buscando draft para {command.champion} {command.role}')  # Todo: suporte para inglês
+    draft(command.champion, command.role)
+    cache.log_stats()
+
+
+# ─── Funcionalidade: Cooldown De Spell ────────────────────────────────────────
+# Instruções: o comando deve conter os seguintes parâmetros:
+#   - SPELL
+#   - ROLE
+
+
+# Notificações de recarga: uma única thread e uma única saída de voz para todos
+# os timers, criado no início da execução
+scheduler = None
+
+
+@dispatcher.register('spell')
+def spell_handler(command: Command, database: dict) -> None:
+    """
+    Agenda a notificação do fim do tempo de recarga de uma spell. Repetir o
+    comando (ex.: spell utilizada novamente) reinicia o timer.
+    """
+
+    spell, role = command.spell, command.role
+    timer = cooldown(database['spells'][spell], database['haste'][role])
+    notification = f'{spell} do {role} estará disponível em breve.'  # Todo: suporte para inglês
+
+    # A spell foi utilizada no momento do pressionamento do atalho: descontando
+    # a latência de captura, reconhecimento e fila
+    issued = command.issued if command.issued is not None else monotonic()
+    latency = monotonic() - issued
+    delay = timer - database['delay']
+
+    # Conferência pelo relógio da partida, se disponível
+    check = None
+    start = game_clock.now(issued) if game_clock is not None else None
+    if start is not None:
+        target = start + delay
+
+        def check() -> float | None:
+            game_clock.sync()
+            now = game_clock.now()
+            if now is None:
+                return None
+            logger.info(f'Notificação de {spell} do {role}: erro de {now - target:+.2f}s em relação ao relógio da partida.')
+            return target - now
+
+    scheduler.schedule((spell, role), max(delay - latency, 0), notification, check)
+
+    # Todo: suporte para inglês
+    logger.info(
+        f'Notificação de {spell} do {role} agendada. Você será notificado {database["delay"]}s antes da spell estar disponível '
+        f'(latência descontada: {latency:.2f}s).')
+    logger.info('Timers ativos: {}'.format(', '.join(
+        f'{spell} {role} ({remaining:.0f}s)' for (spell, role), remaining in scheduler.active())))
 
 
 if __name__ == '__main__':
@@ -176,15 +265,40 @@ if __name__ == '__main__':
     create_logfile()
 
     # Carregando o banco de dados e modelo
-    database = load_data()
-    model, vectorizer = load_model()
+    database = registry.get('database')
+    classifier = load_classifier()
+    resolver = Resolver(database)
     logger.success('Modelo carregado com sucesso!')
 
-    # Preparando o serviço de reconhecimento de fala
+    # Carregando os demais arquivos de dados em memória
+    registry.warm_up()
+
+    # Som, voz e atalho do sistema atual
+    backends = create_backends(database['backend'])
+    scheduler = Scheduler(backends.tts.voice)
+
+    # Relógio da partida
+    if database['game_clock']:
+        game_clock = GameClock(database['game_clock'])
+
+    # Descartando counters de patches anteriores
+    cache.invalidate(database['patch'])
+
+    # Pré-carregando os counters para evitar acessos à rede durante a partida
+    if database['prefetch']:
+        prefetch(database)
+
+    # Preparando o serviço de reconhecimento de fala: o microfone permanece
+    # aberto e o ruído ambiente é estimado continuamente pelo detector de voz
     r = sr.Recognizer()
-    with sr.Microphone() as source:
-        r.adjust_for_ambient_noise(source)
+    stream = CaptureStream(microphone_reader()).start() if database['input'] == 'hotkey' else None
+
+    logger.success(f'Pronto para receber comandos em {perf_counter() - startup:.2f}s.')
 
-    while True:
-        keyboard.on_press(partial(button_trigger, r=r))
-        sleep(10)
+    # Laço de eventos: uma única inscrição na fonte de entrada e uma fila de comandos
+    runtime = Runtime(partial(listen_command, stream=stream, recognizer=create_recognizer(database, r),
+                              resolver=resolver, database=database),
+                      partial(execute_command, database=database,
+                              classifier=classifier, resolver=resolver))
+    source = hotkey_source(backends.hotkey) if database['input'] == 'hotkey' else stdin_source
+    asyncio.run(runtime.run(source))
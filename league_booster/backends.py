@@ -0,0 +1,225 @@
+import importlib.util
+import shutil
+import subprocess
+import sys
+import threading
+from typing import NamedTuple
+
+from loguru import logger
+
+# Sons de aviso disponíveis (assets/sounds/<nome>.wav)
+CUES = ('listening', 'success')
+
+
+def load_cues() -> dict:
+    """
+    Carrega os sons de aviso em memória, uma única vez.
+    """
+
+    cues = {}
+    for name in CUES:
+        with open(f'assets/sounds/{name}.wav', 'rb') as file:
+            cues[name] = file.read()
+    return cues
+
+
+# ─── Sons De Aviso ────────────────────────────────────────────────────────────
+
+
+class WindowsCue:
+    """
+    Sons de aviso no Windows (winsound), reproduzidos a partir da memória.
+    """
+
+    def __init__(self) -> None:
+        import winsound
+
+        self._winsound = winsound
+        self.cues = load_cues()
+
+    def play(self, name: str) -> None:
+        self._winsound.PlaySound(self.cues[name], self._winsound.SND_MEMORY)
+
+
+class LinuxCue:
+    """
+    Sons de aviso no Linux (aplay), reproduzidos a partir da memória.
+    """
+
+    def __init__(self) -> None:
+        self.cues = load_cues()
+        self._player = shutil.which('aplay')
+        if self._player is None:
+            logger.warning('aplay não encontrado: os sons de aviso estão desativados.')
+
+    def play(self, name: str) -> None:
+        if self._player is not None:
+            subprocess.run([self._player, '-q', '-'], input=self.cues[name],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+class NullCue:
+    """
+    Sons de aviso silenciosos: apenas registra os sons solicitados (testes e benchmarks).
+    """
+
+    def __init__(self) -> None:
+        self.played = []
+
+    def play(self, name: str) -> None:
+        self.played.append(name)
+
+
+# ─── Voz ──────────────────────────────────────────────────────────────────────
+
+
+class WindowsTTS:
+    """
+    Voz do Windows (SAPI).
+    """
+
+    def voice(self):
+        """
+        Cria a saída de voz na thread atual (o COM é inicializado por thread) e
+        retorna a função que fala um texto.
+        """
+
+        import pythoncom
+        import win32com.client as wincom
+
+        pythoncom.CoInitialize()
+        return wincom.Dispatch("SAPI.SpVoice").Speak
+
+
+class LinuxTTS:
+    """
+    Voz no Linux (espeak-ng ou espeak).
+
+    Parâmetros:
+    -----------
+    language: str
+        Voz do espeak
+    """
+
+    def __init__(self, language: str = 'pt-br') -> None:
+        self.language = language
+        self._program = shutil.which('espeak-ng') or shutil.which('espeak')
+
+    def voice(self):
+        def speak(text: str) -> None:
+            if self._program is None:
+                logger.warning(f'espeak não encontrado: {text}')
+                return
+            subprocess.run([self._program, '-v', self.language, text],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return speak
+
+
+class NullTTS:
+    """
+    Voz silenciosa: apenas registra os textos falados (testes e benchmarks).
+    """
+
+    def __init__(self) -> None:
+        self.spoken = []
+
+    def voice(self):
+        return self.spoken.append
+
+
+# ─── Atalho ───────────────────────────────────────────────────────────────────
+
+
+class KeyboardHotkey:
+    """
+    Atalho de teclado global através da biblioteca keyboard (Windows; Linux como root).
+    """
+
+    def subscribe(self, key: str, callback):
+        """
+        Executa `callback` a cada pressionamento da tecla e retorna a função que cancela a inscrição.
+        """
+
+        import keyboard
+
+        hook = keyboard.on_press_key(key, lambda event: callback())
+        return lambda: keyboard.unhook(hook)
+
+
+class EvdevHotkey:
+    """
+    Atalho de teclado global no Linux, lido diretamente dos dispositivos de
+    entrada (evdev; requer permissão de leitura em /dev/input).
+    """
+
+    # Nomes das teclas no evdev
+    KEYS = {'=': 'KEY_EQUAL', '-': 'KEY_MINUS', '\\': 'KEY_BACKSLASH'}
+
+    def subscribe(self, key: str, callback):
+        import selectors
+
+        import evdev
+
+        code = evdev.ecodes.ecodes[self.KEYS.get(key, f'KEY_{key.upper()}')]
+        devices = [evdev.InputDevice(path) for path in evdev.list_devices()]
+        devices = [device for device in devices
+                   if code in device.capabilities().get(evdev.ecodes.EV_KEY, [])]
+        stop = threading.Event()
+
+        def listen() -> None:
+            selector = selectors.DefaultSelector()
+            for device in devices:
+                selector.register(device, selectors.EVENT_READ)
+            while not stop.is_set():
+                for selected, _ in selector.select(timeout=0.5):
+                    for event in selected.fileobj.read():
+                        if event.type == evdev.ecodes.EV_KEY and event.code == code and event.value == 1:
+                            callback()
+
+        threading.Thread(target=listen, name='hotkey', daemon=True).start()
+        return stop.set
+
+
+class NullHotkey:
+    """
+    Atalho inativo (os comandos vêm de outra fonte, ex.: terminal ou testes).
+    """
+
+    def subscribe(self, key: str, callback):
+        return lambda: None
+
+
+# ─── Seleção ──────────────────────────────────────────────────────────────────
+
+
+class Backends(NamedTuple):
+    """
+    Implementações de som, voz e atalho utilizadas pelo assistente.
+    """
+
+    cue: object
+    tts: object
+    hotkey: object
+
+
+def create_backends(name: str = 'auto') -> Backends:
+    """
+    Cria as implementações de um sistema.
+
+    Parâmetros:
+    -----------
+    name: str
+        'windows', 'linux', 'null' (silenciosas, para testes e benchmarks) ou
+        'auto' (sistema atual)
+    """
+
+    if name == 'auto':
+        name = 'windows' if sys.platform == 'win32' else 'linux'
+    if name == 'windows':
+        return Backends(WindowsCue(), WindowsTTS(), KeyboardHotkey())
+    if name == 'linux':
+        hotkey = EvdevHotkey() if importlib.util.find_spec('evdev') else KeyboardHotkey()
+        return Backends(LinuxCue(), LinuxTTS(), hotkey)
+    if name == 'null':
+        return Backends(NullCue(), NullTTS(), NullHotkey())
+    raise ValueError(f'Sistema "{name}" desconhecido. Opções: auto, windows, linux, null')
@@ -0,0 +1,525 @@
+import contextlib
+import glob
+import io
+import json
+import os
+import random
+import sys
+import threading
+import tracemalloc
+import types
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from statistics import median
+from time import monotonic, perf_counter
+
+from loguru import logger
+
+# ─── Utilitários ──────────────────────────────────────────────────────────────
+
+
+def measure(func, *args, repeat: int = 20) -> dict:
+    """
+    Mede o tempo de execução e o pico de memória de uma função.
+
+    Parâmetros:
+    -----------
+    func: callable
+        Função a ser medida
+    args:
+        Argumentos da função
+    repeat: int
+        Quantidade de execuções para o cálculo da mediana
+
+    Retorna:
+    --------
+    dict:
+        Mediana do tempo (s), pico de memória (bytes) e resultado da função
+    """
+
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = func(*args)
+        times.append(perf_counter() - start)
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': median(times), 'peak': peak, 'result': result}
+
+
+def report(name: str, baseline: dict, candidate: dict) -> None:
+    """
+    Registra no log a comparação entre duas medições.
+    """
+
+    speedup = baseline['seconds'] / max(candidate['seconds'], 1e-12)
+    logger.info(
+        f'[{name}] atual: {baseline["seconds"]*1e3:.3f} ms / {baseline["peak"]/1e6:.2f} MB | '
+        f'novo: {candidate["seconds"]*1e3:.3f} ms / {candidate["peak"]/1e6:.2f} MB | '
+        f'{speedup:.1f}x mais rápido')
+
+
+# ─── Parser Do u.gg ───────────────────────────────────────────────────────────
+
+
+def synthetic_page(seed: int = 10, padding: int = 2000) -> str:
+    """
+    Gera uma página no formato das páginas de counters do u.gg.
+
+    Parâmetros:
+    -----------
+    seed: int
+        Semente dos valores aleatórios
+    padding: int
+        Quantidade de blocos de estado adicionais, simulando o restante da página
+
+    Retorna:
+    --------
+    str:
+        Conteúdo HTML da página
+    """
+
+    rng = random.Random(seed)
+    with open('assets/draft/champions.json', 'r') as file:
+        ids = list(json.load(file))
+
+    state = {}
+    for n in range(padding):
+        state[f'filler_{n}'] = {'stats': [rng.random() for _ in range(20)]}
+    for role in ['top', 'mid', 'jungle', 'supp', 'adc']:
+        state[f'br1_platinum_plus_{role}'] = {'counters': [
+            {'champion_id': int(champion_id),
+             'matches': rng.randint(100, 5000),
+             'win_rate': round(rng.uniform(40, 60), 2)}
+            for champion_id in rng.sample(ids, 40)]}
+
+    body = '<div>' * 200 + '</div>' * 200
+    script = json.dumps(state, separators=(',', ':'))
+    return (f'<html><head><title>u.gg</title></head><body>{body}'
+            f'<script id="reactn-preloaded-state">window.__REACTN_PRELOADED_STATE__ = {script}</script>'
+            f'</body></html>')
+
+
+def load_pages(pattern: str = 'assets/fixtures/ugg/*.html') -> list:
+    """
+    Carrega páginas salvas do u.gg. Se não houver nenhuma, gera uma página sintética.
+    """
+
+    pages = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, 'r', encoding='utf-8') as file:
+            pages.append(file.read())
+    return pages or [synthetic_page()]
+
+
+def legacy_parse_counters(html: str, role: str) -> list:
+    """
+    Implementação anterior da extração de counters (BeautifulSoup + fatiamento de texto).
+    """
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    response = soup.find('script', {'id': 'reactn-preloaded-state'}).text
+    del soup
+
+    role = role.replace('support', 'supp')
+    start = response.index(f'platinum_plus_{role}')
+    start = response.index('counters', start) + 11
+    end = response.index(']', start)
+    response = response[start+1:end -
+                        1].replace('},{', ' ').replace('"', '').split(' ')
+
+    matchups = []
+    for matchup in response:
+        matchup = matchup.split(',')
+        matchups.append((matchup[0].split(':')[1],
+                         float(matchup[-1].split(':')[1])))
+    return matchups
+
+
+def benchmark_parser(role: str = 'top', repeat: int = 20) -> None:
+    """
+    Compara o tempo e o pico de memória da extração de counters atual e anterior.
+    """
+
+    from ugg_parser import parse_counters
+
+    for n, page in enumerate(load_pages()):
+        baseline = measure(legacy_parse_counters, page, role, repeat=repeat)
+        candidate = measure(parse_counters, page, role, repeat=repeat)
+        assert [tuple(m) for m in candidate['result']] == baseline['result']
+        report(f'parser #{n} ({len(page)/1e6:.1f} MB)', baseline, candidate)
+
+
+# ─── Draft ────────────────────────────────────────────────────────────────────
+
+
+def legacy_draft_options(counters_dict: dict, role: str, duos: dict) -> list:
+    """
+    Implementação anterior da seleção de duos (busca por substring em todos os duos).
+    """
+
+    role = role.replace('support', 'supp')
+
+    options = {}
+    for roles in duos:
+        if role in roles:
+            duos_role = duos[roles]
+            for counter in counters_dict:
+                for duo in duos_role:
+                    if counter in duo:
+                        options[f'{duo} - {roles}'] = counters_dict[counter] + \
+                            duos_role[duo]
+
+    options = {k: v for k, v in sorted(
+        options.items(), key=lambda item: item[1], reverse=True)}
+    return list(options.items())[:10]
+
+
+def benchmark_draft(role: str = 'jungle', repeat: int = 200) -> None:
+    """
+    Compara a seleção de duos atual (índice por campeão) com a anterior.
+    """
+
+    from draft_commands import build_duo_index, draft_options
+
+    rng = random.Random(10)
+    with open('assets/draft/champions.json', 'r') as file:
+        names = list(json.load(file).values())
+    with open('assets/draft/duos.json', 'r') as file:
+        duos = json.load(file)
+    counters_dict = {name: rng.uniform(-10, 10) for name in rng.sample(names, 40)}
+    index = build_duo_index(duos)
+
+    # O carregamento de duos.json fazia parte de cada chamada
+    def legacy() -> list:
+        with open('assets/draft/duos.json', 'r') as file:
+            return legacy_draft_options(counters_dict, role, json.load(file))
+
+    baseline = measure(legacy, repeat=repeat)
+    candidate = measure(draft_options, counters_dict, role, index, repeat=repeat)
+    report('draft', baseline, candidate)
+
+
+def benchmark_team(enemies: int = 5, repeat: int = 200) -> None:
+    """
+    Compara o ranking contra o time inimigo a partir dos counters de cada
+    inimigo (dicionários) com a leitura única da matriz de confrontos (memory map).
+    """
+
+    import tempfile
+
+    import numpy as np
+    from matchups import read_matchups, save_matchups
+    from ranking import rank_array
+
+    with open('assets/draft/champions.json', 'r') as file:
+        names = sorted(set(json.load(file).values()))
+    roles = ['top', 'mid', 'jungle', 'support', 'adc']
+    rng = np.random.default_rng(10)
+    deltas = rng.uniform(-10, 10, (len(names), len(names), len(roles))).astype(np.float16)
+    directory = tempfile.TemporaryDirectory()
+    save_matchups(f'{directory.name}/matchups.json', deltas, names, names, roles, 'br1', '13_7')
+    matrix = read_matchups(f'{directory.name}/matchups.json')
+    team = [(names[i], roles[i % len(roles)]) for i in rng.choice(len(names), enemies, replace=False)]
+    results = [matrix.counters(*enemy) for enemy in team]
+
+    # Os counters de cada inimigo eram combinados a partir dos dicionários
+    def legacy() -> list:
+        options = sorted(set().union(*results))
+        index = {option: i for i, option in enumerate(options)}
+        scores = np.full((len(options), len(results)), np.nan)
+        for j, result in enumerate(results):
+            for option, score in result.items():
+                scores[index[option], j] = score
+        return list(rank_array(options, np.nansum(scores, axis=1), priority=np.sum(scores > 0, axis=1)))
+
+    def current() -> list:
+        scores = matrix.scores(team)
+        return list(rank_array(matrix.options, np.nansum(scores, axis=1), priority=np.sum(scores > 0, axis=1)))
+
+    baseline = measure(legacy, repeat=repeat)
+    candidate = measure(current, repeat=repeat)
+    assert candidate['result'] == baseline['result']
+    report(f'time inimigo ({enemies} inimigos)', baseline, candidate)
+
+
+# ─── Classificação De Comandos ────────────────────────────────────────────────
+
+
+def benchmark_inference(samples: int = 2000, repeat: int = 5) -> None:
+    """
+    Compara a classificação esparsa com o caminho do scikit-learn (vetor denso + predict),
+    verificando se as previsões são idênticas.
+    """
+
+    import numpy as np
+    import pandas as pd
+    from inference import Classifier
+    from load import load_model
+
+    try:
+        model, vectorizer = load_model()
+    except FileNotFoundError:
+        logger.warning('Modelo não encontrado: comparação da classificação ignorada.')
+        return
+    classifier = Classifier.from_sklearn(model, vectorizer)
+
+    texts = pd.read_feather('assets/model/model_data.feather')['input']
+    texts = texts.sample(min(samples, len(texts)), random_state=10).tolist()
+
+    # Equivalência
+    expected = model.predict(vectorizer.transform(texts).toarray().astype(np.int8))
+    assert classifier.predict_batch(texts) == expected.tolist()
+
+    # Latência por comando
+    def legacy_single() -> list:
+        return [model.predict(vectorizer.transform([text]).toarray().astype(np.int8))[0]
+                for text in texts[:200]]
+
+    def sparse_single() -> list:
+        return [classifier.predict(text) for text in texts[:200]]
+
+    report('comando (x200)', measure(legacy_single, repeat=repeat),
+           measure(sparse_single, repeat=repeat))
+
+    # Lote
+    def legacy_batch() -> list:
+        return model.predict(vectorizer.transform(texts).toarray().astype(np.int8))
+
+    report(f'lote ({len(texts)})', measure(legacy_batch, repeat=repeat),
+           measure(classifier.predict_batch, texts, repeat=repeat))
+
+
+# ─── Variantes De Input ───────────────────────────────────────────────────────
+
+
+def legacy_variate_input(user_input: str, database: dict) -> list:
+    """
+    Implementação anterior da geração de variantes (recursiva e sem remoção de repetições).
+    """
+
+    variants = [user_input]
+    for mistake in list(database['mistakes'].keys()):
+        if mistake in user_input.split(' '):
+            for variant in database['mistakes'][mistake]:
+                variants.extend(legacy_variate_input(
+                    user_input.replace(mistake, variant), database))
+    return variants
+
+
+def benchmark_variants(repeat: int = 3) -> None:
+    """
+    Compara a geração de variantes atual com a anterior, para todos os campeões e roles.
+    """
+
+    from load import load_data
+    from model import variate_input
+
+    database = load_data()
+    inputs = [f'{command} {champion} {role}'
+              for command in ['counters', 'draft']
+              for champion in database['champions']
+              for role in database['roles']]
+
+    def legacy() -> int:
+        return sum(len(legacy_variate_input(user_input, database)) for user_input in inputs)
+
+    def current() -> int:
+        return sum(len(list(variate_input(user_input, database))) for user_input in inputs)
+
+    baseline = measure(legacy, repeat=repeat)
+    candidate = measure(current, repeat=repeat)
+    logger.info(f'Variantes geradas: {baseline["result"]} (atual) | {candidate["result"]} (novo, sem repetições)')
+    report(f'variantes ({len(inputs)} inputs)', baseline, candidate)
+
+
+# ─── Pipeline Completo ────────────────────────────────────────────────────────
+
+
+def start_fixture_server() -> ThreadingHTTPServer:
+    """
+    Servidor HTTP local no lugar do u.gg: responde com as páginas salvas em
+    assets/fixtures/ugg (uma por campeão, ex.: ahri.html) ou com uma página
+    sintética determinística.
+    """
+
+    pages = {os.path.splitext(os.path.basename(path))[0]: path
+             for path in glob.glob('assets/fixtures/ugg/*.html')}
+    synthetic = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            champion = self.path.split('/')[3] if self.path.count('/') >= 3 else ''
+            if champion in pages:
+                with open(pages[champion], 'rb') as file:
+                    body = file.read()
+            else:
+                if champion not in synthetic:
+                    synthetic[champion] = synthetic_page(
+                        seed=zlib.crc32(champion.encode()), padding=200).encode()
+                body = synthetic[champion]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_transcripts(path: str = 'assets/fixtures/transcripts.tsv') -> list:
+    """
+    Carrega os comandos gravados: texto reconhecido e comando esperado, separados por tabulação.
+    """
+
+    with open(path, 'r', encoding='utf-8') as file:
+        return [tuple(line.rstrip('\n').split('\t')) for line in file if line.strip()]
+
+
+def benchmark_pipeline(transcripts: str = 'assets/fixtures/transcripts.tsv',
+                       thresholds: str = 'assets/fixtures/thresholds.json', rounds: int = 2) -> bool:
+    """
+    Reproduz os comandos gravados no pipeline completo (interpretação, despacho,
+    counters/draft com um servidor local e ranking), sem acesso à rede.
+
+    A primeira rodada encontra o cache de counters vazio; as seguintes, preenchido.
+
+    A acurácia mínima depende do classificador: com o modelo treinado a partir
+    do banco de dados versionado (train_model), os comandos gravados atingem
+    94.4%; apenas com o resolvedor (sem modelo), 59.4%. Os mínimos ficam logo
+    abaixo dessas referências, de forma que uma regressão em qualquer uma das
+    etapas de interpretação é detectada.
+
+    Parâmetros:
+    -----------
+    transcripts: str
+        Arquivo de comandos gravados
+    thresholds: str
+        Limites de p95 (ms) de cada etapa e acurácia mínima (com e sem modelo)
+    rounds: int
+        Quantidade de reproduções dos comandos
+
+    Retorna:
+    --------
+    bool:
+        False se algum comando falhar, se a acurácia ficar abaixo do mínimo ou
+        se alguma etapa ultrapassar seu limite
+    """
+
+    import importlib.util
+    import tempfile
+
+    import draft_commands
+    from backends import create_backends
+    from cache import CountersCache
+    from commands import dispatcher, interpret
+    from load import load_classifier
+    from resolver import Resolver
+    from scheduler import Scheduler
+    from tracing import new_command, percentiles
+
+    # Aplicação, com os handlers de cada comando registrados
+    spec = importlib.util.spec_from_file_location(
+        'app', os.path.join(os.path.dirname(os.path.abspath(__file__)), '__init__.py'))
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+
+    # Som, voz e atalho silenciosos (no assistente, criados no início da execução)
+    app.backends = create_backends('null')
+    app.scheduler = Scheduler(app.backends.tts.voice)
+
+    # u.gg local e cache de counters temporário
+    server = start_fixture_server()
+    draft_commands.UGG_URL = f'http://127.0.0.1:{server.server_port}'
+    directory = tempfile.TemporaryDirectory()
+    draft_commands.cache = app.cache = CountersCache(f'{directory.name}/counters.db')
+
+    database = app.registry.get('database')
+    resolver = Resolver(database)
+    try:
+        classifier = load_classifier()
+        baseline = 'model'
+    except FileNotFoundError:
+        logger.warning('Modelo não encontrado: apenas o resolvedor será utilizado.')
+        classifier = types.SimpleNamespace(predict=lambda text: '')
+        baseline = 'resolver'
+
+    # Registros das etapas
+    entries = []
+    sink = logger.add(lambda message: entries.append(json.loads(message)), level='TRACE',
+                      format='{extra[json]}', filter=lambda record: 'span' in record['extra'])
+
+    commands = load_transcripts(transcripts)
+    correct = failed = 0
+    start = perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(rounds):
+                for text, expected in commands:
+                    new_command()
+                    command = interpret(text, resolver, classifier,
+                                        database['resolver_threshold'], monotonic())
+                    future = dispatcher.dispatch(command, database)
+                    if future is not None and future.exception() is not None:
+                        failed += 1
+                    label = f'spell {command.spell} {command.role}' if command.intent == 'spell' else \
+                        f'{command.intent.replace("_team", "")} {command.champion} {command.role}' if command.intent else ''
+                    correct += label == expected
+    finally:
+        elapsed = perf_counter() - start
+        logger.remove(sink)
+        server.shutdown()
+        for key, _ in app.scheduler.active():
+            app.scheduler.cancel(key)
+        directory.cleanup()
+
+    with open(thresholds, 'r') as file:
+        limits = json.load(file)
+
+    total = len(commands) * rounds
+    accuracy = correct / total
+    minimum = limits['accuracy'][baseline]
+    ok = failed == 0 and accuracy >= minimum
+    (logger.info if ok else logger.error)(
+        f'[pipeline] {total} comandos em {elapsed:.2f}s ({total/elapsed:.0f} comandos/s), '
+        f'acurácia: {accuracy:.1%} (mínimo {"com modelo" if baseline == "model" else "sem modelo"}: '
+        f'{minimum:.1%}), falhas: {failed}')
+
+    # Distribuição de cada etapa e comparação com os limites
+    for stage, stats in percentiles(entries).items():
+        limit = limits.get(stage)
+        regressed = limit is not None and stats['p95'] > limit
+        ok &= not regressed
+        message = (f'[{stage}] n={stats["count"]} p50: {stats["p50"]:.2f} ms | '
+                   f'p95: {stats["p95"]:.2f} ms | p99: {stats["p99"]:.2f} ms'
+                   + (f' | limite p95: {limit} ms' if limit is not None else ''))
+        (logger.error if regressed else logger.info)(message)
+    return ok
+
+
+if __name__ == '__main__':
+    # Os arquivos de dados são relativos à pasta raiz do projeto
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    # Uso: python benchmark.py [pipeline]
+    if sys.argv[1:] == ['pipeline']:
+        sys.exit(0 if benchmark_pipeline() else 1)
+
+    benchmark_parser()
+    benchmark_draft()
+    benchmark_team()
+    benchmark_inference()
+    benchmark_variants()
+    if not benchmark_pipeline():
+        sys.exit(1)
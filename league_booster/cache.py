@@ -0,0 +1,149 @@
+import json
+import sqlite3
+import threading
+from time import time
+
+from loguru import logger
+
+
+class CountersCache:
+    """
+    Cache local dos counters obtidos no u.gg.
+
+    Os dados são indexados por (campeão, role, região, patch) e mantidos em
+    duas camadas: um dicionário em memória, consultado primeiro, e um banco
+    SQLite em disco, que preserva os dados entre sessões.
+
+    Parâmetros:
+    -----------
+    path: str
+        Caminho do banco de dados SQLite
+    ttl: float
+        Tempo de validade das entradas, em segundos
+    """
+
+    def __init__(self, path: str = 'assets/draft/counters.db', ttl: float = 86400) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(
+                self.path, check_same_thread=False)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS counters ('
+                'champion TEXT, role TEXT, region TEXT, patch TEXT, '
+                'data TEXT, created REAL, '
+                'PRIMARY KEY (champion, role, region, patch))')
+            self._connection.commit()
+        return self._connection
+
+    def get(self, champion: str, role: str, region: str, patch: str) -> dict | None:
+        """
+        Busca os counters de um campeão no cache.
+
+        Retorna:
+        --------
+        dict: se houver entrada válida
+        None: se a entrada não existir ou estiver expirada
+        """
+
+        key = (champion, role, region, patch)
+        now = time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._connect().execute(
+                    'SELECT data, created FROM counters '
+                    'WHERE champion=? AND role=? AND region=? AND patch=?', key).fetchone()
+                if row is not None:
+                    entry = (json.loads(row[0]), row[1])
+                    self._memory[key] = entry
+
+            if entry is None or now - entry[1] > self.ttl:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return entry[0]
+
+    def contains(self, champion: str, role: str, region: str, patch: str) -> bool:
+        """
+        Verifica se existe entrada válida no cache, sem contabilizar acertos ou falhas.
+        """
+
+        key = (champion, role, region, patch)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._connect().execute(
+                    'SELECT created FROM counters '
+                    'WHERE champion=? AND role=? AND region=? AND patch=?', key).fetchone()
+                created = None if row is None else row[0]
+            else:
+                created = entry[1]
+        return created is not None and time() - created <= self.ttl
+
+    def set(self, champion: str, role: str, region: str, patch: str, data: dict) -> None:
+        """
+        Armazena os counters de um campeão no cache.
+        """
+
+        key = (champion, role, region, patch)
+        created = time()
+
+        with self._lock:
+            self._memory[key] = (data, created)
+            connection = self._connect()
+            connection.execute(
+                'INSERT OR REPLACE INTO counters VALUES (?, ?, ?, ?, ?, ?)',
+                (*key, json.dumps(data), created))
+            connection.commit()
+
+    def invalidate(self, patch: str | None = None) -> None:
+        """
+        Remove entradas do cache.
+
+        Parâmetros:
+        -----------
+        patch: str | None
+            Se fornecido, remove apenas as entradas de patches diferentes deste.
+            Se None, remove todas as entradas.
+        """
+
+        with self._lock:
+            connection = self._connect()
+            if patch is None:
+                self._memory.clear()
+                connection.execute('DELETE FROM counters')
+            else:
+                self._memory = {key: entry for key, entry in self._memory.items()
+                                if key[3] == patch}
+                connection.execute(
+                    'DELETE FROM counters WHERE patch != ?', (patch,))
+            connection.commit()
+
+    def stats(self) -> dict:
+        """
+        Retorna as estatísticas de uso do cache.
+        """
+
+        total = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0}
+
+    def log_stats(self) -> None:
+        """
+        Registra as estatísticas de uso do cache no log.
+        """
+
+        stats = self.stats()
+        logger.info(
+            f'Cache de counters: {stats["hits"]} acertos, {stats["misses"]} falhas ({stats["hit_rate"]:.0%}).')
@@ -0,0 +1,250 @@
+import glob
+import os
+import queue
+import threading
+import wave
+from collections import deque
+from time import monotonic, sleep
+
+import numpy as np
+import speech_recognition as sr
+from loguru import logger
+from recognizer import SAMPLE_RATE, SAMPLE_WIDTH
+
+# Quadros de 30 ms
+FRAME_SAMPLES = 480
+FRAME_SECONDS = FRAME_SAMPLES / SAMPLE_RATE
+
+
+class VoiceDetector:
+    """
+    Detecção de voz por energia, quadro a quadro, com estimativa adaptativa do ruído.
+
+    O nível de ruído é uma média móvel da energia dos quadros sem voz, de
+    forma que o limite acompanha mudanças no ambiente (ventilador, partida
+    com som alto) sem nova calibração.
+
+    Parâmetros:
+    -----------
+    ratio: float
+        Um quadro contém voz se sua energia for `ratio` vezes maior que o ruído
+    adaptation: float
+        Peso de cada quadro sem voz na média móvel do ruído
+    min_energy: float
+        Energia mínima de um quadro com voz (ambientes silenciosos)
+    """
+
+    def __init__(self, ratio: float = 3.0, adaptation: float = 0.05, min_energy: float = 200.0) -> None:
+        self.ratio = ratio
+        self.adaptation = adaptation
+        self.min_energy = min_energy
+        self.noise = None
+
+    @staticmethod
+    def energy(frame: bytes) -> float:
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        return float(np.sqrt(np.mean(samples ** 2))) if len(samples) else 0.0
+
+    def is_speech(self, frame: bytes, adapt: bool = True) -> bool:
+        """
+        Verifica se um quadro contém voz, atualizando a estimativa de ruído.
+        """
+
+        energy = self.energy(frame)
+        if self.noise is None:
+            self.noise = energy
+        speech = energy > max(self.noise * self.ratio, self.min_energy)
+        if adapt and not speech:
+            self.noise += self.adaptation * (energy - self.noise)
+        return speech
+
+
+class CaptureStream:
+    """
+    Captura contínua de áudio: os quadros são lidos em segundo plano para um
+    buffer circular, de forma que o dispositivo fica sempre aberto e o áudio
+    imediatamente anterior ao atalho é preservado.
+
+    Parâmetros:
+    -----------
+    read: callable
+        Função bloqueante que retorna o próximo quadro (bytes, FRAME_SAMPLES amostras)
+    detector: VoiceDetector | None
+        Detector de voz
+    buffer: float
+        Duração do buffer circular, em segundos
+    pre_roll: float
+        Duração do áudio anterior ao atalho incluída na captura, em segundos
+    """
+
+    def __init__(self, read, detector: VoiceDetector | None = None, buffer: float = 2.0, pre_roll: float = 0.3) -> None:
+        self.read = read
+        self.detector = detector or VoiceDetector()
+        self.pre_roll = pre_roll
+        self.timings = {}
+        self._ring = deque(maxlen=int(buffer / FRAME_SECONDS))
+        self._listener = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self) -> 'CaptureStream':
+        """
+        Inicia a leitura contínua em segundo plano.
+        """
+
+        self._thread = threading.Thread(target=self._run, name='capture', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while True:
+            frame = self.read()
+            if not frame:
+                break
+            now = monotonic()
+            with self._lock:
+                self._ring.append((now, frame))
+                listener = self._listener
+            if listener is not None:
+                listener.put((now, frame))
+            else:
+                # Fora das capturas, todo quadro sem voz atualiza o ruído
+                self.detector.is_speech(frame)
+        if self._listener is not None:
+            self._listener.put((monotonic(), b''))
+
+    def frames(self, issued: float | None = None, timeout: float = 8.0, limit: float = 5.0,
+               hangover: float = 0.4, onset: int = 3, mute: tuple | None = None):
+        """
+        Quadros de um comando: o áudio desde pouco antes do atalho até o fim da fala.
+
+        Parâmetros:
+        -----------
+        issued: float | None
+            Instante (relógio monotônico) do atalho. Se None, o instante atual.
+        timeout: float
+            Tempo máximo de espera pelo início da fala, em segundos
+        limit: float
+            Duração máxima da fala, em segundos
+        hangover: float
+            Silêncio, em segundos, que encerra a fala
+        onset: int
+            Quantidade de quadros seguidos com voz que inicia a fala
+        mute: tuple | None
+            Intervalo (início, fim), no relógio monotônico, cujos quadros são
+            descartados (ex.: som de aviso reproduzido após o atalho)
+
+        Retorna:
+        --------
+        Iterator[bytes]
+        """
+
+        start = monotonic()
+        issued = start if issued is None else issued
+        listener = queue.Queue()
+        with self._lock:
+            backlog = [(t, frame) for t, frame in self._ring if t >= issued - self.pre_roll]
+            self._listener = listener
+        self.timings = {'queue': start - issued}
+
+        def source():
+            captured = iter(backlog)
+            while True:
+                t, frame = next(captured, None) or listener.get()
+                if not frame:
+                    return
+                # Quadros gravados, ainda que em parte, durante o intervalo silenciado
+                if mute is not None and t > mute[0] and t - FRAME_SECONDS < mute[1]:
+                    continue
+                yield frame
+
+        voiced, silent, speech_start = 0, 0, None
+        try:
+            for n, frame in enumerate(source()):
+                speech = self.detector.is_speech(frame, adapt=speech_start is None)
+                yield frame
+
+                elapsed = monotonic() - issued
+                if speech_start is None:
+                    voiced = voiced + 1 if speech else 0
+                    if voiced >= onset:
+                        speech_start = n
+                        self.timings['speech_start'] = elapsed
+                    elif monotonic() - start > timeout:
+                        raise sr.WaitTimeoutError('Nenhuma fala detectada')
+                    continue
+
+                silent = 0 if speech else silent + 1
+                if silent * FRAME_SECONDS >= hangover or (n - speech_start) * FRAME_SECONDS >= limit:
+                    self.timings['speech_end'] = elapsed
+                    return
+        finally:
+            with self._lock:
+                self._listener = None
+
+    def listen(self, issued: float | None = None, **kwargs) -> sr.AudioData:
+        """
+        Captura um comando completo (equivalente ao sr.Recognizer.listen).
+        """
+
+        return sr.AudioData(b''.join(self.frames(issued, **kwargs)), SAMPLE_RATE, SAMPLE_WIDTH)
+
+    def report(self) -> str:
+        """
+        Tempos das etapas da última captura, a partir do atalho, para o log.
+        """
+
+        names = {'queue': 'fila', 'speech_start': 'início da fala', 'speech_end': 'fim da fala',
+                 'transcript': 'transcrição'}
+        return ' | '.join(f'{names[stage]}: {seconds*1e3:.0f} ms'
+                          for stage, seconds in self.timings.items())
+
+
+# ─── Fontes De Áudio ──────────────────────────────────────────────────────────
+
+
+def microphone_reader():
+    """
+    Abre o microfone no formato da captura e retorna a função de leitura de quadros.
+    """
+
+    microphone = sr.Microphone(sample_rate=SAMPLE_RATE, chunk_size=FRAME_SAMPLES)
+    microphone.__enter__()
+    return lambda: microphone.stream.read(FRAME_SAMPLES)
+
+
+def wav_reader(path: str, realtime: bool = True, silence: float = 1.0):
+    """
+    Reproduz um arquivo WAV (PCM 16 kHz, 16 bits, mono) como se fosse o microfone,
+    seguido de `silence` segundos de silêncio.
+    """
+
+    with wave.open(path, 'rb') as file:
+        data = file.readframes(file.getnframes())
+    data += bytes(int(silence * SAMPLE_RATE) * SAMPLE_WIDTH)
+    size = FRAME_SAMPLES * SAMPLE_WIDTH
+    frames = iter([data[n:n + size] for n in range(0, len(data), size)])
+
+    def read() -> bytes:
+        if realtime:
+            sleep(FRAME_SECONDS)
+        return next(frames, b'')
+    return read
+
+
+if __name__ == '__main__':
+    # Reprodução das gravações de teste: tempo de cada etapa, do atalho à transcrição
+    from load import load_data
+    from recognizer import create_recognizer, transcribe
+
+    database = load_data()
+    recognizer = create_recognizer(database, sr.Recognizer())
+    for path in sorted(glob.glob('assets/fixtures/audio/*.wav')):
+        stream = CaptureStream(wav_reader(path)).start()
+        issued = monotonic()
+        try:
+            text = transcribe(recognizer, stream.frames(issued))
+        except (sr.UnknownValueError, sr.WaitTimeoutError):
+            text = ''
+        stream.timings['transcript'] = monotonic() - issued
+        logger.info(f'{os.path.basename(path)} -> "{text}" ({stream.report()})')
@@ -0,0 +1,79 @@
+import json
+from time import monotonic
+
+from loguru import logger
+
+# Endpoint da Live Client Data API do cliente do jogo
+LIVE_CLIENT_URL = 'https://127.0.0.1:2999/liveclientdata/gamestats'
+
+
+class GameClock:
+    """
+    Relógio da partida, sincronizado com o tempo de jogo ("gameTime").
+
+    O tempo de jogo é lido da Live Client Data API ou de um arquivo JSON no
+    mesmo formato (ex.: uma gravação reproduzida por outro processo) e
+    extrapolado pelo relógio monotônico entre as leituras. A cada nova
+    leitura, a diferença entre o valor extrapolado e o valor lido (pausas,
+    atrasos) é corrigida e registrada no log.
+
+    Parâmetros:
+    -----------
+    source: str
+        URL do endpoint "gamestats" ou caminho de um arquivo JSON
+    interval: float
+        Intervalo mínimo, em segundos, entre leituras
+    """
+
+    def __init__(self, source: str = LIVE_CLIENT_URL, interval: float = 5.0) -> None:
+        self.source = source
+        self.interval = interval
+        self._offset = None
+        self._synced = None
+
+    def _read(self) -> float:
+        if self.source.startswith('http'):
+            import requests
+
+            # O cliente do jogo utiliza um certificado autoassinado
+            response = requests.get(self.source, timeout=0.5, verify=False)
+            return float(response.json()['gameTime'])
+        with open(self.source, 'r') as file:
+            return float(json.load(file)['gameTime'])
+
+    def sync(self) -> float | None:
+        """
+        Lê o tempo de jogo e corrige o relógio.
+
+        Retorna:
+        --------
+        float | None:
+            Correção aplicada, em segundos (None na primeira leitura ou em caso de falha)
+        """
+
+        self._synced = monotonic()
+        try:
+            game_time = self._read()
+        except Exception as e:
+            logger.warning(f'Não foi possível ler o tempo de jogo: {e}')
+            return None
+
+        now = monotonic()
+        drift = None if self._offset is None else game_time - (now + self._offset)
+        if drift is not None and abs(drift) > 0.25:
+            logger.info(f'Relógio da partida corrigido em {drift:+.2f}s.')
+        self._offset = game_time - now
+        return drift
+
+    def now(self, at: float | None = None) -> float | None:
+        """
+        Tempo de jogo, em segundos, no instante `at` do relógio monotônico (padrão: agora).
+
+        Retorna None se o tempo de jogo nunca pôde ser lido.
+        """
+
+        if self._synced is None or monotonic() - self._synced >= self.interval:
+            self.sync()
+        if self._offset is None:
+            return None
+        return (monotonic() if at is None else at) + self._offset
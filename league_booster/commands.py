@@ -0,0 +1,151 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from time import monotonic
+from typing import NamedTuple
+
+from loguru import logger
+from tracing import record, span
+
+# Palavras que estendem o comando de counters para todo o time inimigo
+TEAM_WORDS = {'time', 'team'}
+
+
+class Command(NamedTuple):
+    """
+    Comando interpretado, pronto para ser executado.
+    """
+
+    intent: str | None
+    champion: str | None = None
+    role: str | None = None
+    spell: str | None = None
+    confidence: float | None = None
+    text: str = ''
+    issued: float | None = None
+
+    @classmethod
+    def from_label(cls, label: str, text: str = '', confidence: float | None = None) -> 'Command':
+        """
+        Cria o comando a partir de uma saída do modelo (ex.: "counters lee sin top").
+
+        O campeão (ou spell) é tudo o que está entre a intenção e a role, de
+        forma que nomes compostos são preservados.
+        """
+
+        words = label.split()
+        if len(words) < 3:
+            return cls(None, text=text, confidence=confidence)
+        name = ' '.join(words[1:-1])
+        if words[0] == 'spell':
+            return cls('spell', role=words[-1], spell=name, confidence=confidence, text=text)
+        return cls(words[0], champion=name, role=words[-1], confidence=confidence, text=text)
+
+    @classmethod
+    def from_resolution(cls, resolution, text: str = '') -> 'Command':
+        """
+        Cria o comando a partir do resultado do resolvedor (resolver.Resolution).
+        """
+
+        return cls(resolution.command, resolution.champion, resolution.role,
+                   resolution.spell, resolution.confidence, text)
+
+
+def interpret(text: str, resolver, classifier, threshold: float, issued: float | None = None) -> Command:
+    """
+    Interpreta um comando de voz: o resolvedor é consultado primeiro e o
+    modelo é utilizado apenas em caso de baixa confiança.
+
+    Parâmetros:
+    -----------
+    text: str
+        Texto reconhecido
+    resolver: Resolver
+        Interpretador determinístico
+    classifier: Classifier
+        Modelo de IA
+    threshold: float
+        Confiança mínima do resolvedor
+    issued: float | None
+        Instante (relógio monotônico) em que o comando foi solicitado
+
+    Retorna:
+    --------
+    Command
+    """
+
+    with span('resolve'):
+        resolution = resolver.resolve(text)
+    if resolution.label and resolution.confidence >= threshold:
+        command = Command.from_resolution(resolution, text)
+    else:
+        with span('predict'):
+            command = Command.from_label(classifier.predict(text), text)
+
+    # Variação: "counters time" combina os counters de todos os inimigos
+    if command.intent == 'counters' and TEAM_WORDS & set(text.split()):
+        command = command._replace(intent='counters_team')
+    return command._replace(issued=issued)
+
+
+class Dispatcher:
+    """
+    Tabela de despacho de comandos: cada intenção é associada a uma única
+    função, executada em segundo plano (no contexto do comando, ver tracing.py).
+
+    Parâmetros:
+    -----------
+    workers: int
+        Quantidade de comandos executados simultaneamente
+    """
+
+    def __init__(self, workers: int = 4) -> None:
+        self.handlers = {}
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix='command')
+
+    def register(self, intent: str):
+        """
+        Registra a função responsável por uma intenção (utilizado como decorador).
+
+        A função recebe o comando (Command) e o banco de dados do algoritmo.
+        """
+
+        def decorator(handler):
+            self.handlers[intent] = handler
+            return handler
+        return decorator
+
+    def dispatch(self, command: Command, database: dict) -> Future | None:
+        """
+        Executa a função registrada para a intenção do comando.
+
+        Retorna:
+        --------
+        Future | None:
+            Execução em andamento, ou None se a intenção não for conhecida
+        """
+
+        handler = self.handlers.get(command.intent)
+        if handler is None:
+            logger.warning(f'Comando desconhecido: {command.text}')
+            return None
+        future = self._executor.submit(copy_context().run, self._run, handler, command, database)
+        future.add_done_callback(self._log_error)
+        return future
+
+    @staticmethod
+    def _run(handler, command: Command, database: dict) -> None:
+        with span(command.intent):
+            handler(command, database)
+
+        # Tempo total, do pressionamento do atalho ao fim da execução
+        if command.issued is not None:
+            record('command', monotonic() - command.issued, intent=command.intent)
+
+    @staticmethod
+    def _log_error(future: Future) -> None:
+        if future.exception() is not None:
+            logger.opt(exception=future.exception()).error('Falha ao executar comando')
+
+
+# Tabela de despacho global do processo
+dispatcher = Dispatcher()
@@ -0,0 +1,255 @@
+import glob
+import hashlib
+import os
+import shutil
+from array import array
+from datetime import datetime
+from itertools import islice
+
+import pandas as pd
+from loguru import logger
+from similarity import score_pairs
+
+# Colunas do banco de dados do modelo
+COLUMNS = ['input', 'output', 'input_name', 'output_name', 'score']
+
+
+def row_hash(user_input: str, output: str) -> int:
+    """
+    Identificador de 64 bits de uma entrada (input, output), usado na remoção de duplicados.
+    """
+
+    digest = hashlib.blake2b(f'{user_input}\0{output}'.encode('utf-8'), digest_size=8)
+    return int.from_bytes(digest.digest(), 'little')
+
+
+def score_rows(inputs: list, outputs: list) -> pd.DataFrame:
+    """
+    Monta as entradas do banco de dados do modelo, com o score de semelhança entre os nomes.
+
+    Parâmetros:
+    ----------
+    inputs: list
+        Entradas do usuário
+    outputs: list
+        Saídas esperadas
+
+    Retorna:
+    -------
+    pd.DataFrame
+    """
+
+    df = pd.DataFrame({'input': inputs, 'output': outputs})
+    df['input_name'] = [' '.join(x.split(' ')[1:-1]) for x in inputs]
+    df['output_name'] = [' '.join(x.split(' ')[1:-1]) for x in outputs]
+    df['score'] = score_pairs(df['input_name'], df['output_name'])
+    return df
+
+
+class DatasetStore:
+    """
+    Banco de dados do modelo em formato colunar, somente de acréscimo.
+
+    Cada inserção grava apenas as entradas novas em uma nova partição
+    (arquivo feather/Arrow IPC). Os duplicados são descartados através de um
+    índice de hashes, também somente de acréscimo, de forma que inserir novas
+    entradas custa O(entradas novas), e não O(banco de dados inteiro).
+
+    Parâmetros:
+    ----------
+    root: str
+        Pasta das partições e do índice
+    seed: str
+        Banco de dados versionado no repositório (arquivo feather único),
+        importado na primeira utilização e atualizado após cada inserção (ver export)
+    """
+
+    def __init__(self, root: str = 'assets/model/dataset', seed: str = 'assets/model/model_data.feather') -> None:
+        self.root = root
+        self.seed = seed
+        self._index = None
+
+    @property
+    def index_path(self) -> str:
+        return f'{self.root}/index.bin'
+
+    def partitions(self) -> list:
+        """
+        Lista as partições do banco de dados, em ordem de criação.
+        """
+
+        return sorted(glob.glob(f'{self.root}/part-*.feather'))
+
+    def fingerprint(self, rows: int | None = None) -> str:
+        """
+        Identificador do conteúdo das `rows` primeiras entradas (todas, se None),
+        calculado a partir do índice de hashes, que segue a ordem das entradas.
+        """
+
+        self._load_index()
+        data = b''
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as file:
+                data = file.read() if rows is None else file.read(rows * array('Q').itemsize)
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _load_index(self) -> set:
+        if self._index is None:
+            if not os.path.exists(self.root):
+                self._initialize()
+            hashes = array('Q')
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'rb') as file:
+                    hashes.frombytes(file.read())
+            self._index = set(hashes)
+        return self._index
+
+    def _initialize(self) -> None:
+        """
+        Cria o banco de dados, importando o arquivo original se existir.
+        """
+
+        os.makedirs(self.root)
+        self._index = set()
+        if os.path.exists(self.seed):
+            added = self.append(pd.read_feather(self.seed))
+            logger.info(f'Banco de dados do modelo importado de "{self.seed}" ({added} entradas).')
+        self._index = None
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Insere as entradas que ainda não existem no banco de dados.
+
+        Retorna:
+        -------
+        int:
+            Quantidade de entradas inseridas
+        """
+
+        index = self._load_index()
+
+        # Removendo duplicados (no banco de dados e no próprio lote)
+        keep = []
+        new_hashes = array('Q')
+        for user_input, output in zip(df['input'], df['output']):
+            key = row_hash(user_input, output)
+            if key in index:
+                keep.append(False)
+                continue
+            index.add(key)
+            new_hashes.append(key)
+            keep.append(True)
+
+        df = df.loc[keep, COLUMNS].reset_index(drop=True)
+        if len(df) == 0:
+            return 0
+
+        # Nova partição e acréscimo ao índice
+        partitions = self.partitions()
+        number = int(partitions[-1][-13:-8]) + 1 if partitions else 0
+        df.to_feather(f'{self.root}/part-{number:05d}.feather')
+        with open(self.index_path, 'ab') as file:
+            file.write(new_hashes.tobytes())
+
+        return len(df)
+
+    def read(self) -> pd.DataFrame:
+        """
+        Carrega o banco de dados completo.
+        """
+
+        self._load_index()
+        frames = [pd.read_feather(path) for path in self.partitions()]
+        if not frames:
+            return pd.DataFrame(columns=COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def backup(self) -> str:
+        """
+        Salva uma cópia completa do banco de dados (arquivo feather único) na pasta de backups.
+
+        Retorna:
+        -------
+        str:
+            Caminho da cópia
+        """
+
+        folder = f'assets/backups/{datetime.now().strftime("%Y-%m-%d")}'
+        os.makedirs(folder, exist_ok=True)
+        path = f'{folder}/model_data.feather'
+        self.read().to_feather(path)
+        return path
+
+    def export(self) -> None:
+        """
+        Grava o conteúdo completo no banco de dados versionado (`seed`), na
+        mesma ordem das partições, de forma que um clone novo do repositório
+        reconstrói o mesmo banco de dados.
+        """
+
+        self.read().to_feather(f'{self.seed}.tmp')
+        os.replace(f'{self.seed}.tmp', self.seed)
+
+    def rewrite(self, df: pd.DataFrame) -> None:
+        """
+        Substitui todo o conteúdo do banco de dados (ex.: após remoção de entradas).
+
+        O conteúdo atual é copiado para a pasta de backups e o novo conteúdo é
+        gravado em uma pasta temporária, que só então substitui a original.
+        """
+
+        path = self.backup()
+        logger.info(f'Backup do banco de dados do modelo salvo em "{path}".')
+
+        staging = DatasetStore(f'{self.root}.new', seed='')
+        if os.path.exists(staging.root):
+            shutil.rmtree(staging.root)
+        staging.append(df)
+
+        previous = f'{self.root}.old'
+        if os.path.exists(previous):
+            shutil.rmtree(previous)
+        os.replace(self.root, previous)
+        os.replace(staging.root, self.root)
+        shutil.rmtree(previous)
+        self._index = None
+        self.export()
+
+
+def ingest(pairs, store: DatasetStore | None = None, batch_size: int = 5000) -> int:
+    """
+    Insere um fluxo de pares (input, output) no banco de dados do modelo.
+
+    Os pares são consumidos em lotes: cada lote é pontuado e gravado antes do
+    próximo ser gerado, de forma que o fluxo nunca é materializado por inteiro.
+    Ao final, o banco de dados versionado é regravado uma única vez (ver DatasetStore.export).
+
+    Parâmetros:
+    ----------
+    pairs: Iterable[tuple]
+        Pares (input, output), por exemplo gerados por iter_variants
+    store: DatasetStore | None
+        Banco de dados de destino. Se None, utiliza o banco de dados padrão.
+    batch_size: int
+        Quantidade de pares por lote
+
+    Retorna:
+    -------
+    int:
+        Quantidade de entradas novas inseridas
+    """
+
+    store = store or DatasetStore()
+    pairs = iter(pairs)
+    added = 0
+    while batch := list(islice(pairs, batch_size)):
+        inputs, outputs = zip(*batch)
+        added += store.append(score_rows(list(inputs), list(outputs)))
+
+    # Atualizando o banco de dados versionado
+    if added:
+        store.export()
+
+    logger.info(
+        f'Foram adicionadas {added} novas entradas ao banco de dados do modelo.')
+    return added
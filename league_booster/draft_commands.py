@@ -1,9 +1,23 @@
 import json
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 
-import requests as re
-from bs4 import BeautifulSoup
-from load import backup
+import numpy as np
+from cache import CountersCache
+from load import backup, load_json
 from loguru import logger
+from matchups import read_matchups, save_matchups
+from ranking import Ranking, rank, rank_array
+from registry import registry
+from tracing import span
+from ugg_parser import parse_counters
+
+# Cache local dos counters
+cache = CountersCache()
+
+# Endereço base das páginas de counters
+UGG_URL = 'https://u.gg'
 
 
 def gather_duos(patch: str) -> None:
@@ -20,6 +34,8 @@ def gather_duos(patch: str) -> None:
     None
     """
 
+    import requests as re
+
     url = f'https://stats2.u.gg/lol/1.5/duos/br1/{patch}/ranked_solo_5x5/platinum_plus/1.5.0.json'
     r = re.get(url).json()[0]
 
@@ -32,8 +48,7 @@ def gather_duos(patch: str) -> None:
             'top_jungle': {}}
 
     # Banco de dados de campeões
-    with open(f'assets/draft/champions.json', 'r') as file:
-        champions = json.load(file)
+    champions = registry.get('champions')
 
     for n, combination in enumerate(duos_combination):
         for duo in combination:
@@ -61,6 +76,12 @@ def gather_duos(patch: str) -> None:
 
     with open(f'assets/draft/duos.json', 'w') as file:
         json.dump(duos, file, indent=1)
+
+    # Índice por campeão
+    index = build_duo_index(duos)
+    with open(f'assets/draft/duos_index.json', 'w') as file:
+        json.dump({champion: [list(entry) for entry in zip(labels, pairs, scores)]
+                   for champion, (labels, pairs, scores) in index.items()}, file)
     logger.info(f'Dados do patch {patch.replace("_",".")} salvos com sucesso!')
 
 
@@ -78,6 +99,8 @@ def gather_champions(patch: str) -> None:
     None
     """
 
+    import requests as re
+
     url = f'https://static.bigbrain.gg/assets/lol/riot_static/{patch}/data/en_US/champion.json'
     r = re.get(url).json()['data']
 
@@ -92,117 +115,397 @@ def gather_champions(patch: str) -> None:
     logger.info(f'Dados de campeões do patch {patch} salvos com sucesso!')
 
 
-def draft(command: str) -> None:
+def gather_matchups(workers: int = 4, rate: float = 5.0, dtype: str = 'float16',
+                    path: str = 'assets/draft/matchups.json', database: dict | None = None) -> None:
     """
-    Obtém duos que são counters de determinado campeão em determinada role.
-    
+    Constrói a matriz de confrontos do patch (campeão × opção × role) a partir
+    dos counters de todos os campeões, em todas as roles.
+
+    As páginas são obtidas pelo pré-carregamento (com limite de requisições e
+    retomada pelo cache) e convertidas uma única vez em um array compacto.
+
     Parâmetros:
     ----------
-    command: str
-        Comando do usuário
-    
+    workers: int
+        Quantidade máxima de requisições simultâneas
+    rate: float
+        Quantidade máxima de requisições por segundo
+    dtype: str
+        Tipo do array ('float16' ocupa metade do espaço, com precisão de
+        centésimos de ponto percentual)
+    path: str
+        Arquivo de ids da matriz (o array é salvo ao lado, ver save_matchups)
+    database: dict | None
+        Banco de dados do algoritmo (campeões, roles, região e patch). Se None, é carregado do disco.
+
     Retorna:
     -------
     None
     """
 
-    # Interpretando comando
-    _, role = command.split(' ')
+    from prefetch import prefetch
+
+    database = database or registry.get('database')
+    region, patch = database['region'], database['patch']
+    prefetch(database, workers, rate, UGG_URL)
+
+    # Ids: campeões consultados, opções e roles
+    champions = list(database['champions'])
+    options = sorted(set(registry.get('champions').values()))
+    roles = list(database['roles'])
+    option_ids = {option: j for j, option in enumerate(options)}
+
+    deltas = np.full((len(champions), len(options), len(roles)), np.nan, dtype=dtype)
+    missing = 0
+    for i, champion in enumerate(champions):
+        for k, role in enumerate(roles):
+            data = cache.get(champion, role, region, patch)
+            if data is None:
+                missing += 1
+                continue
+            for option, delta in data.items():
+                deltas[i, option_ids[option], k] = delta
+
+    save_matchups(path, deltas, champions, options, roles, region, patch)
+    logger.info(f'Matriz de confrontos do patch {patch.replace("_",".")} salva com sucesso! '
+                f'({deltas.nbytes/1e3:.0f} kB, {missing} consultas sem dados)')
+
 
-    # Banco de dados de duos
-    with open(f'assets/draft/duos.json', 'r') as file:
-        duos = json.load(file)
+registry.register('matchups', 'assets/draft/matchups.json', read_matchups)
 
-    counters_dict = counters(command)
+
+def load_matchups(database: dict):
+    """
+    Carrega a matriz de confrontos através do registro de arquivos.
+
+    Retorna:
+    -------
+    MatchupMatrix | None:
+        Matriz do patch e região atuais, ou None se ela não existir, estiver
+        desatualizada ou não puder ser lida
+    """
+
+    try:
+        matrix = registry.get('matchups')
+    except (OSError, ValueError):
+        return None
+    if (matrix.patch, matrix.region) != (database['patch'], database['region']):
+        return None
+    return matrix
+
+
+def build_duo_index(duos: dict) -> dict:
+    """
+    Indexa os duos por campeão.
+
+    Parâmetros:
+    ----------
+    duos: dict
+        Duos agrupados por combinação de roles (formato de duos.json)
+
+    Retorna:
+    -------
+    dict:
+        Campeão -> (rótulos dos duos, combinações de roles, scores), com os
+        scores armazenados em um array compacto
+    """
+
+    entries = {}
+    for pair, combination in duos.items():
+        for label, score in combination.items():
+            for champion in label.split(' & '):
+                entries.setdefault(champion, []).append((label, pair, score))
+
+    return {champion: (tuple(entry[0] for entry in values),
+                       tuple(entry[1] for entry in values),
+                       array('d', (entry[2] for entry in values)))
+            for champion, values in entries.items()}
+
+
+def read_duo_index(path: str) -> dict:
+    """
+    Lê o índice de duos pré-processado (formato de duos_index.json).
+    """
+
+    raw = load_json(path)
+    return {champion: (tuple(entry[0] for entry in values),
+                       tuple(entry[1] for entry in values),
+                       array('d', (entry[2] for entry in values)))
+            for champion, values in raw.items()}
+
+
+registry.register('duo_index', 'assets/draft/duos_index.json', read_duo_index)
+
+
+def load_duo_index() -> dict:
+    """
+    Carrega o índice de duos através do registro de arquivos.
+
+    Se o índice pré-processado não existir, ele é construído a partir de duos.json.
+    """
+
+    try:
+        return registry.get('duo_index')
+    except FileNotFoundError:
+        return build_duo_index(registry.get('duos'))
+
+
+def draft_options(counters_dict: dict, role: str, index: dict, top: int = 10) -> Ranking:
+    """
+    Seleciona os melhores duos que contém counters de um campeão.
+
+    Parâmetros:
+    ----------
+    counters_dict: dict
+        Counters do campeão (nome -> score)
+    role: str
+        Role do campeão
+    index: dict
+        Índice de duos (ver build_duo_index)
+    top: int
+        Quantidade de opções retornadas
+
+    Retorna:
+    -------
+    Ranking:
+        Melhores opções, ordenadas pelo score
+    """
 
     # Formatando
     role = role.replace('support', 'supp')
 
-    # Opções de draft
-    draft_options = {}
-    for roles in duos:
-        if role in roles:
-            duos_role = duos[roles]
-            for counter in counters_dict:
-                for duo in duos_role:
-                    if counter in duo:
-                        draft_options[f'{duo} - {roles}'] = counters_dict[counter] + \
-                            duos_role[duo]
+    options = {}
+    for counter, counter_score in counters_dict.items():
+        entry = index.get(counter)
+        if entry is None:
+            continue
+        for label, pair, score in zip(*entry):
+            if role in pair:
+                option = f'{label} - {pair}'
+                score += counter_score
+                if score > options.get(option, float('-inf')):
+                    options[option] = score
 
-    # Ordenando pelo score
-    draft_options = {k: v for k, v in sorted(
-        draft_options.items(), key=lambda item: item[1], reverse=True)}
+    return rank(options, top)
 
-    # Mostrando os 10 primeiros resultados
-    for i, option in enumerate(draft_options):
-        if i == 10:
-            break
-        print(f'[{i+1}º] {option}: {round(draft_options[option],2)}')
 
+def draft(champion: str, role: str, top: int = 10) -> Ranking:
+    """
+    Obtém duos que são counters de determinado campeão em determinada role.
+    
+    Parâmetros:
+    ----------
+    champion: str
+        Nome do campeão
+    role: str
+        Nome da role
+    top: int
+        Quantidade de opções mostradas
+    
+    Retorna:
+    -------
+    Ranking:
+        Melhores opções de duo
+    """
+
+    counters_dict = counters(champion, role)
+
+    # Mostrando os melhores resultados
+    with span('rank'):
+        options = draft_options(counters_dict, role, load_duo_index(), top)
+        options.display()
+
+    return options
+
+
+def create_session(workers: int):
+    """
+    Cria uma sessão HTTP com um pool de conexões do tamanho do número de workers.
+    """
+
+    import requests as re
+    from requests.adapters import HTTPAdapter
+
+    session = re.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def fetch_counters(champion: str, role: str, region: str = 'br1', session=None, base_url: str | None = None, champions: dict | None = None) -> dict:
+    """
+    Obtém os counters de um campeão, em uma determinada role, diretamente do u.gg.
+
+    Parâmetros:
+    ------------
+    champion: str
+        Nome do campeão
+    role: str
+        Nome da role
+    region: str
+        Região dos dados
+    session: requests.Session | None
+        Sessão HTTP reutilizada entre requisições. Se None, abre uma nova conexão.
+    base_url: str | None
+        Endereço base do site. Se None, utiliza UGG_URL (que pode apontar para um servidor local de testes).
+    champions: dict | None
+        Mapa de id para nome dos campeões. Se None, é carregado do disco.
+
+    Retorno:
+    --------
+    dict:
+        Dicionário de counters (não ordenado) do campeão na role.
+    """
+
+    import requests as re
+
+    # Web Scrapping
+    http = session or re
+    base_url = base_url or UGG_URL
+    with span('fetch', champion=champion, role=role):
+        r = http.get(
+            f'{base_url}/lol/champions/{champion}/counter?role={role}?region={region}')
+    with span('parse'):
+        matchups = parse_counters(r.text, role)
 
-def counters(command: str, display: bool = False) -> dict:
+    # Banco de dados de campeões
+    if champions is None:
+        champions = registry.get('champions')
+
+    # Confrontos
+    counters = {champions[matchup.champion_id]: matchup.win_rate - 50
+                for matchup in matchups}
+
+    return counters
+
+
+def lookup_counters(champion: str, role: str, database: dict, session=None, champions: dict | None = None) -> dict:
+    """
+    Obtém os counters de um campeão, consultando a matriz de confrontos e o
+    cache antes de acessar a rede.
+    """
+
+    with span('lookup', champion=champion, role=role) as fields:
+        matrix = load_matchups(database)
+        if matrix is not None and matrix.covers(champion, role):
+            fields['cache'] = 'matrix'
+            return matrix.counters(champion, role)
+
+        counters = cache.get(champion, role, database['region'], database['patch'])
+        fields['cache'] = 'hit' if counters is not None else 'miss'
+        if counters is None:
+            counters = fetch_counters(champion, role, database['region'],
+                                      session, champions=champions)
+            cache.set(champion, role, database['region'],
+                      database['patch'], counters)
+    return counters
+
+
+def counters(champion: str, role: str, display: bool = False, top: int = 10) -> dict:
     """
     Obtém lista de counters de um determinado campeão, em uma determinada role.
     
     Parâmetros:
     ------------
-    command: str
-        Comando a ser interpretado.
+    champion: str
+        Nome do campeão
+    role: str
+        Nome da role
     display: bool
-        Se True, mostra os 10 primeiros resultados.
-        Se False, não mostra os 10 primeiros resultados.
+        Se True, mostra os melhores resultados.
+        Se False, não mostra os melhores resultados.
+    top: int
+        Quantidade de resultados mostrados
     
     Retorno:
     --------
     dict:
-        Dicionário de counters de um determinado campeão, em uma determinada role.
+        Dicionário (não ordenado) de counters de um determinado campeão, em uma determinada role.
     """
 
-    # Interpretando comando
-    champion, role = command.split(' ')
+    database = registry.get('database')
 
-    # Web Scrapping
-    r = re.get(
-        f'https://u.gg/lol/champions/{champion}/counter?role={role}?region=br1')
-    soup = BeautifulSoup(r.text, 'html.parser')
-    response = soup.find('script', {'id': 'reactn-preloaded-state'}).text
-    del soup  # Limpando memória
+    counters = lookup_counters(champion, role, database)
 
-    # Formatando
-    role = role.replace('support', 'supp')
+    if display:
+        with span('rank'):
+            rank(counters, top).display(offset=50, suffix='%')
 
-    # Selecionando dados
-    start = response.index(f'platinum_plus_{role}')
-    start = response.index('counters', start) + 11
-    end = response.index(']', start)
-    response = response[start+1:end -
-                        1].replace('},{', ' ').replace('"', '').split(' ')
+    return counters
 
-    # Banco de dados de campeões
-    with open(f'assets/draft/champions.json', 'r') as file:
-        champions = json.load(file)
 
-    # Confrontos
-    counters = {}
-    for matchup in response:
-        matchup = matchup.split(',')
-        counters[champions[matchup[0].split(':')[1]]] = float(
-            matchup[-1].split(':')[1]) - 50
-    del response  # Limpando memória
+def counters_batch(enemies: list, display: bool = False, top: int = 10) -> tuple:
+    """
+    Obtém os counters de vários campeões inimigos simultaneamente e os combina em
+    um ranking único.
 
-    # Ordenando pelo score
-    counters = {k: v for k, v in sorted(
-        counters.items(), key=lambda item: item[1], reverse=True)}
+    Parâmetros:
+    ------------
+    enemies: list
+        Lista de (campeão, role) dos inimigos
+    display: bool
+        Se True, mostra os melhores resultados do ranking combinado.
+    top: int
+        Quantidade de opções do ranking combinado
+
+    Retorno:
+    --------
+    (list, Ranking):
+        Counters de cada inimigo (na ordem de entrada) e ranking combinado,
+        ordenado pela quantidade de inimigos countereados e pelo score somado.
+    """
+
+    database = registry.get('database')
+
+    matchups = load_matchups(database)
+    if matchups is not None and all(matchups.covers(*enemy) for enemy in enemies):
+        # Matriz de confrontos do patch: uma única leitura para todos os inimigos
+        with span('lookup', cache='matrix'):
+            matrix = matchups.scores(enemies)
+            present = ~np.isnan(matrix).all(axis=1)
+            matrix = matrix[present]
+            options = [option for option, keep in zip(matchups.options, present) if keep]
+            index = {option: i for i, option in enumerate(options)}
+        results = [{option: float(score) for option, score in zip(options, column)
+                    if not np.isnan(score)} for column in matrix.T]
+    else:
+        # Banco de dados de campeões, compartilhado entre as consultas
+        champions = registry.get('champions')
+
+        # Consultas simultâneas
+        workers = max(len(enemies), 1)
+        session = create_session(workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Cada consulta herda o contexto do comando (identificador no log de etapas)
+            futures = [executor.submit(copy_context().run, lookup_counters,
+                                       *enemy, database, session, champions)
+                       for enemy in enemies]
+            results = [future.result() for future in futures]
+        session.close()
+
+        # Matriz de scores: opções × inimigos
+        options = sorted(set().union(*results))
+        index = {option: i for i, option in enumerate(options)}
+        matrix = np.full((len(options), len(enemies)), np.nan)
+        for j, result in enumerate(results):
+            for option, score in result.items():
+                matrix[index[option], j] = score
+
+    # Ranking combinado
+    score = np.nansum(matrix, axis=1)
+    countered = np.sum(matrix > 0, axis=1)
+    ranking = rank_array(options, score, top, priority=countered)
 
     if display:
-        for i, option in enumerate(counters):
-            if i == 10:
-                break
-            print(f'[{i+1}º] {option}: {round(counters[option],2) + 50}%')
+        for position, option, option_score in ranking:
+            print(f'[{position}º] {option}: {round(option_score,2)} '
+                  f'({countered[index[option]]}/{len(enemies)} inimigos)')
 
-    return counters
+    return (results, ranking)
 
 
 if __name__ == '__main__':
     gather_champions('13.7.1')
     gather_duos('13_7')
+    gather_matchups()
@@ -0,0 +1,183 @@
+import json
+import pickle
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from time import perf_counter
+
+import numpy as np
+from dataset import DatasetStore
+from loguru import logger
+from sklearn.feature_extraction.text import (CountVectorizer, HashingVectorizer,
+                                             TfidfVectorizer)
+from sklearn.linear_model import SGDClassifier
+from sklearn.model_selection import KFold
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.tree import DecisionTreeClassifier
+
+# ─── Configurações ────────────────────────────────────────────────────────────
+
+# Vetorizadores disponíveis, a partir da quantidade máxima de tokens
+VECTORIZERS = {
+    'count': lambda n: CountVectorizer(max_features=n, stop_words=['']),
+    'binary': lambda n: CountVectorizer(max_features=n, stop_words=[''], binary=True),
+    'tfidf': lambda n: TfidfVectorizer(max_features=n, stop_words=['']),
+    'hashing': lambda n: HashingVectorizer(n_features=n, alternate_sign=False, norm=None),
+}
+
+# Classificadores disponíveis
+CLASSIFIERS = {
+    'tree': lambda: DecisionTreeClassifier(random_state=10),
+    'naive_bayes': lambda: MultinomialNB(),
+    'linear': lambda: SGDClassifier(random_state=10),
+}
+
+# Grade padrão de configurações
+GRID = {'max_features': [250, 500, 1000],
+        'vectorizer': list(VECTORIZERS),
+        'classifier': list(CLASSIFIERS)}
+
+# Banco de dados do modelo, carregado uma única vez em cada processo
+_data = None
+
+
+def _load_data(inputs: list, outputs: list) -> None:
+    global _data
+    _data = (np.array(inputs, dtype=object), np.array(outputs, dtype=object))
+
+
+def split_label(label: str) -> dict:
+    """
+    Separa uma saída do modelo em suas partes (ex.: "counters lee sin top").
+
+    Retorna:
+    --------
+    dict:
+        Comando, campeão (ou spell) e role
+    """
+
+    words = label.split(' ')
+    return {'command': words[0], 'champion': ' '.join(words[1:-1]), 'role': words[-1]}
+
+
+def confusion(y_true: list, y_pred: list, top: int = 10) -> dict:
+    """
+    Acurácia e confusões mais frequentes de cada parte do comando (comando, campeão e role).
+    """
+
+    result = {}
+    true_parts = [split_label(label) for label in y_true]
+    pred_parts = [split_label(label) for label in y_pred]
+    for part in ('command', 'champion', 'role'):
+        pairs = [(t[part], p[part]) for t, p in zip(true_parts, pred_parts)]
+        errors = Counter(pair for pair in pairs if pair[0] != pair[1])
+        result[part] = {
+            'accuracy': 1 - sum(errors.values()) / max(len(pairs), 1),
+            'confusions': [{'expected': t, 'predicted': p, 'count': n}
+                           for (t, p), n in errors.most_common(top)]}
+    return result
+
+
+# ─── Avaliação ────────────────────────────────────────────────────────────────
+
+
+def evaluate(config: dict, folds: int = 5, latency_samples: int = 200) -> dict:
+    """
+    Avalia uma configuração de vetorizador e classificador por validação cruzada (k-fold).
+
+    Parâmetros:
+    -----------
+    config: dict
+        Configuração (max_features, vectorizer e classifier)
+    folds: int
+        Quantidade de partições da validação cruzada
+    latency_samples: int
+        Quantidade de comandos classificados um a um na medição de latência
+
+    Retorna:
+    --------
+    dict:
+        Acurácia, confusões, tempo de treinamento, tamanho do modelo e latência de inferência
+    """
+
+    x, y = _data
+    scores, train_times, latencies, sizes = [], [], [], []
+    y_true, y_pred = [], []
+
+    for train, test in KFold(folds, shuffle=True, random_state=10).split(x):
+        vectorizer = VECTORIZERS[config['vectorizer']](config['max_features'])
+        model = CLASSIFIERS[config['classifier']]()
+
+        start = perf_counter()
+        model.fit(vectorizer.fit_transform(x[train]), y[train])
+        train_times.append(perf_counter() - start)
+
+        predicted = model.predict(vectorizer.transform(x[test]))
+        scores.append(float(np.mean(predicted == y[test])))
+        y_true.extend(y[test])
+        y_pred.extend(predicted)
+        sizes.append(len(pickle.dumps((model, vectorizer))))
+
+        # Latência no caminho do atalho: um comando por vez
+        for text in x[test][:latency_samples]:
+            start = perf_counter()
+            model.predict(vectorizer.transform([text]))
+            latencies.append(perf_counter() - start)
+
+    return {**config,
+            'accuracy': float(np.mean(scores)),
+            'accuracy_std': float(np.std(scores)),
+            'confusion': confusion(y_true, y_pred),
+            'train_seconds': float(np.mean(train_times)),
+            'model_bytes': int(np.mean(sizes)),
+            'latency_ms': {'p50': float(np.percentile(latencies, 50) * 1e3),
+                           'p95': float(np.percentile(latencies, 95) * 1e3)}}
+
+
+def sweep(grid: dict = GRID, folds: int = 5, workers: int = 4,
+          path: str = 'assets/model/evaluation.json') -> list:
+    """
+    Avalia todas as combinações da grade de configurações em paralelo.
+
+    Parâmetros:
+    -----------
+    grid: dict
+        Valores de max_features, vectorizer e classifier a serem combinados
+    folds: int
+        Quantidade de partições da validação cruzada
+    workers: int
+        Quantidade de processos
+    path: str
+        Arquivo de resultados (JSON)
+
+    Retorna:
+    --------
+    list:
+        Resultados de cada configuração, em ordem decrescente de acurácia
+    """
+
+    model_data = DatasetStore().read()
+    configs = [dict(zip(grid, values)) for values in product(*grid.values())]
+    logger.info(
+        f'Avaliando {len(configs)} configurações ({folds} partições, {len(model_data)} entradas).')
+
+    start = perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_load_data,
+                             initargs=(model_data['input'].tolist(), model_data['output'].tolist())) as pool:
+        results = list(pool.map(evaluate, configs, [folds] * len(configs)))
+    results.sort(key=lambda result: result['accuracy'], reverse=True)
+
+    for result in results:
+        logger.info(
+            f'{result["vectorizer"]:>8} | {result["classifier"]:>11} | {result["max_features"]:>5} | '
+            f'acurácia: {result["accuracy"]:.3f} | treino: {result["train_seconds"]:.2f}s | '
+            f'{result["model_bytes"]/1e3:.0f} kB | p95: {result["latency_ms"]["p95"]:.2f} ms')
+
+    with open(path, 'w') as file:
+        json.dump({'folds': folds, 'rows': len(model_data), 'results': results}, file, indent=1)
+    logger.success(f'Avaliação concluída em {perf_counter() - start:.1f}s. Resultados salvos em "{path}".')
+    return results
+
+
+if __name__ == '__main__':
+    sweep()
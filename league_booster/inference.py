@@ -0,0 +1,143 @@
+import re
+
+import numpy as np
+from loguru import logger
+
+# Mesmo padrão de tokens utilizado pelo CountVectorizer
+TOKEN_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+
+
+class Classifier:
+    """
+    Classificador de comandos a partir do modelo exportado em formato compacto.
+
+    Os textos são convertidos diretamente em contagens esparsas de tokens
+    (índice da coluna -> contagem) e a árvore de decisão é percorrida a partir
+    delas, sem construir matrizes densas.
+
+    Parâmetros:
+    -----------
+    vocabulary: dict
+        Token -> índice da coluna
+    children_left, children_right: list
+        Índices dos nós filhos (-1 nas folhas)
+    feature: list
+        Coluna avaliada em cada nó
+    threshold: list
+        Limite de cada nó (valores menores ou iguais seguem para a esquerda)
+    leaf_class: list
+        Índice da classe de cada nó
+    classes: list
+        Nomes das classes
+    """
+
+    def __init__(self, vocabulary: dict, children_left: list, children_right: list, feature: list,
+                 threshold: list, leaf_class: list, classes: list) -> None:
+        self.vocabulary = vocabulary
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.leaf_class = leaf_class
+        self.classes = classes
+
+    @classmethod
+    def from_sklearn(cls, model, vectorizer) -> 'Classifier':
+        """
+        Cria o classificador a partir do modelo e do vetorizador do scikit-learn.
+        """
+
+        tree = model.tree_
+        return cls(dict(vectorizer.vocabulary_),
+                   tree.children_left.tolist(),
+                   tree.children_right.tolist(),
+                   tree.feature.tolist(),
+                   tree.threshold.tolist(),
+                   tree.value[:, 0, :].argmax(axis=1).tolist(),
+                   list(model.classes_))
+
+    def tokenize(self, text: str) -> dict:
+        """
+        Converte um texto em contagens esparsas de tokens (índice da coluna -> contagem).
+        """
+
+        counts = {}
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            column = self.vocabulary.get(token)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+        return counts
+
+    def predict(self, text: str) -> str:
+        """
+        Classifica um comando de voz.
+        """
+
+        counts = self.tokenize(text)
+        left, right = self.children_left, self.children_right
+        feature, threshold = self.feature, self.threshold
+
+        node = 0
+        while left[node] != -1:
+            if counts.get(feature[node], 0) <= threshold[node]:
+                node = left[node]
+            else:
+                node = right[node]
+        return self.classes[self.leaf_class[node]]
+
+    def predict_batch(self, texts: list) -> list:
+        """
+        Classifica vários comandos de voz.
+        """
+
+        return [self.predict(text) for text in texts]
+
+
+def export_compact(model, vectorizer, path: str = 'assets/model/model.npz') -> None:
+    """
+    Exporta o modelo e o vetorizador treinados em formato compacto (arrays NumPy).
+
+    Parâmetros:
+    -----------
+    model: DecisionTreeClassifier
+        Modelo treinado
+    vectorizer: CountVectorizer
+        Vetorizador treinado
+    path: str
+        Caminho do arquivo exportado
+    """
+
+    tree = model.tree_
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+
+    np.savez(path,
+             terms=np.array(terms, dtype=str),
+             children_left=tree.children_left.astype(np.int32),
+             children_right=tree.children_right.astype(np.int32),
+             feature=tree.feature.astype(np.int32),
+             threshold=tree.threshold.astype(np.float64),
+             leaf_class=tree.value[:, 0, :].argmax(axis=1).astype(np.int32),
+             classes=np.array(model.classes_, dtype=str))
+    logger.success(f'Modelo compacto salvo em "{path}".')
+
+
+def load_compact(path: str = 'assets/model/model.npz') -> Classifier:
+    """
+    Carrega o classificador em formato compacto.
+    """
+
+    with np.load(path, allow_pickle=False) as data:
+        vocabulary = {term: n for n, term in enumerate(data['terms'].tolist())}
+        return Classifier(vocabulary,
+                          data['children_left'].tolist(),
+                          data['children_right'].tolist(),
+                          data['feature'].tolist(),
+                          data['threshold'].tolist(),
+                          data['leaf_class'].tolist(),
+                          data['classes'].tolist())
+
+
+if __name__ == '__main__':
+    from load import load_model
+
+    export_compact(*load_model())
@@ -1,3 +1,4 @@
+import json
 import os
 import pickle
 import shutil
@@ -6,17 +7,28 @@ from datetime import datetime
 import yaml
 
 
-def load_data() -> dict: #Todo: Testes
+def load_data(path: str = 'database.yaml') -> dict: #Todo: Testes
     """
     Carrega o banco de dados do algoritmo.
     """
 
-    with open('database.yaml', 'r') as f:
+    with open(path, 'r') as f:
         database = yaml.safe_load(f)
 
     return database
 
 
+def load_json(path: str) -> dict:
+    """
+    Carrega um arquivo JSON.
+    """
+
+    with open(path, 'r') as file:
+        data = json.load(file)
+
+    return data
+
+
 def load_model() -> tuple: #Todo: Testes
     """
     Carrega modelo e vetorizador.
@@ -30,6 +42,23 @@ def load_model() -> tuple: #Todo: Testes
     return (model, vectorizer)
 
 
+def load_classifier(): #Todo: Testes
+    """
+    Carrega o classificador de comandos.
+
+    O modelo compacto (assets/model/model.npz) é carregado sem importar o
+    scikit-learn. Se ele não existir, o classificador é construído a partir
+    dos pickles.
+    """
+
+    from inference import Classifier, load_compact
+
+    if os.path.exists('assets/model/model.npz'):
+        return load_compact('assets/model/model.npz')
+
+    return Classifier.from_sklearn(*load_model())
+
+
 def backup(file: str) -> None: #Todo: Testes
     """
     Função utilizada para criar backup de arquivo.
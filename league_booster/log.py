@@ -24,4 +24,13 @@ def create_logfile():
     # Criando o arquivo de log
     logger.add(
         f'logs/{month}/Day {day} {time}.log',
+        filter=lambda record: 'span' not in record['extra'],
+    )
+
+    # Duração das etapas de cada comando (tracing.py), em formato JSON lines
+    logger.add(
+        f'logs/{month}/Day {day} {time}.jsonl',
+        level='TRACE',
+        format='{extra[json]}',
+        filter=lambda record: 'span' in record['extra'],
     )
@@ -0,0 +1,124 @@
+import glob
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+
+class MatchupMatrix:
+    """
+    Matriz de confrontos de um patch: diferença de win rate (win rate - 50) de
+    cada opção contra cada campeão, em cada role.
+
+    Os dados ficam em um único array (campeão × opção × role), lido do disco
+    sob demanda (memory map). Confrontos sem dados são NaN.
+
+    Parâmetros:
+    -----------
+    deltas: np.ndarray
+        Array (campeão × opção × role) de diferenças de win rate
+    champions: list
+        Campeões consultados (nomes do banco de dados), na ordem do primeiro eixo
+    options: list
+        Opções (nomes de champions.json), na ordem do segundo eixo
+    roles: list
+        Roles, na ordem do terceiro eixo
+    region: str
+        Região dos dados
+    patch: str
+        Patch dos dados
+    """
+
+    def __init__(self, deltas: np.ndarray, champions: list, options: list, roles: list, region: str, patch: str) -> None:
+        self.deltas = deltas
+        self.champions = list(champions)
+        self.options = list(options)
+        self.roles = list(roles)
+        self.region = region
+        self.patch = patch
+        self.champion_ids = {champion: i for i, champion in enumerate(self.champions)}
+        self.role_ids = {role: k for k, role in enumerate(self.roles)}
+
+    def covers(self, champion: str, role: str) -> bool:
+        """
+        Verifica se a matriz contém os confrontos de um campeão em uma role.
+        """
+
+        i, k = self.champion_ids.get(champion), self.role_ids.get(role)
+        return i is not None and k is not None and not np.isnan(self.deltas[i, :, k]).all()
+
+    def scores(self, enemies: list) -> np.ndarray:
+        """
+        Confrontos de várias opções contra vários inimigos, em uma única leitura.
+
+        Parâmetros:
+        -----------
+        enemies: list
+            Lista de (campeão, role) dos inimigos
+
+        Retorna:
+        --------
+        np.ndarray:
+            Matriz (opção × inimigo) de diferenças de win rate (float64)
+        """
+
+        rows = [self.champion_ids[champion] for champion, _ in enemies]
+        roles = [self.role_ids[role] for _, role in enemies]
+        return self.deltas[rows, :, roles].T.astype(np.float64)
+
+    def counters(self, champion: str, role: str) -> dict:
+        """
+        Counters de um campeão em uma role (mesmo formato de fetch_counters).
+        """
+
+        column = self.scores([(champion, role)])[:, 0]
+        return {self.options[j]: float(column[j]) for j in np.flatnonzero(~np.isnan(column))}
+
+
+def save_matchups(path: str, deltas: np.ndarray, champions: list, options: list, roles: list, region: str, patch: str) -> None:
+    """
+    Salva a matriz de confrontos: os mapas de ids em `path` (.json) e o array
+    em um arquivo .npy de mesmo nome, com a data da construção.
+
+    Cada construção grava um novo array, de forma que o assistente em execução
+    continua lendo o array anterior (memory map) sem conflito. Os dois arquivos
+    são gravados em caminhos temporários e renomeados (array primeiro), de
+    forma que o registro de arquivos nunca encontra uma matriz incompleta.
+    """
+
+    stem = os.path.splitext(path)[0]
+    array_path = f'{stem}.{datetime.now().strftime("%Y%m%d%H%M%S%f")}.npy'
+    with open(f'{array_path}.tmp', 'wb') as file:
+        np.save(file, deltas)
+    os.replace(f'{array_path}.tmp', array_path)
+
+    with open(f'{path}.tmp', 'w') as file:
+        json.dump({'region': region, 'patch': patch, 'dtype': str(deltas.dtype),
+                   'shape': list(deltas.shape), 'array': os.path.basename(array_path),
+                   'champions': list(champions), 'options': list(options),
+                   'roles': list(roles)}, file)
+    os.replace(f'{path}.tmp', path)
+
+    # Arrays de construções anteriores (os que ainda estiverem em uso são removidos na próxima construção)
+    for previous in glob.glob(f'{glob.escape(stem)}.*.npy'):
+        if previous != array_path:
+            try:
+                os.remove(previous)
+            except OSError:
+                pass
+
+
+def read_matchups(path: str) -> MatchupMatrix:
+    """
+    Lê a matriz de confrontos a partir do arquivo de ids (.json), mapeando o
+    array (.npy) em memória sem copiá-lo.
+    """
+
+    with open(path, 'r') as file:
+        meta = json.load(file)
+    deltas = np.load(os.path.join(os.path.dirname(path), meta['array']), mmap_mode='r')
+    if list(deltas.shape) != meta['shape']:
+        raise ValueError(f'Matriz de confrontos "{path}" inconsistente com seus ids.')
+    return MatchupMatrix(deltas, meta['champions'], meta['options'], meta['roles'],
+                         meta['region'], meta['patch'])
@@ -1,12 +1,21 @@
+import json
+import os
 import pickle
-import winsound
-from difflib import SequenceMatcher
+import random
+import tracemalloc
+from datetime import datetime
+from itertools import product
+from time import perf_counter
 
-import numpy as np
-import pandas as pd
 import speech_recognition as sr
+from backends import create_backends
+from dataset import DatasetStore, ingest
+from inference import export_compact
 from load import *
 from loguru import logger
+from registry import registry
+from scipy import sparse
+from similarity import score_pairs
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.model_selection import train_test_split
 from sklearn.tree import DecisionTreeClassifier
@@ -14,54 +23,153 @@ from sklearn.tree import DecisionTreeClassifier
 # ─── Modelo ───────────────────────────────────────────────────────────────────
 
 
-def train_model(max_features: int = 1000, test_size: float = 0.2, export: bool = False) -> tuple:
+def vectorize(store: DatasetStore, max_features: int = 1000, incremental: bool = False) -> tuple:
     """
-    Treina o modelo com os dados coletados do banco de dados
+    Vetoriza o banco de dados do modelo, mantendo a matriz esparsa (CSR).
+
+    No modo incremental, o vocabulário e a matriz da última vetorização são
+    reaproveitados: apenas as entradas novas do banco de dados são vetorizadas
+    e os tokens novos são acrescentados ao fim do vocabulário, sem alterar o
+    índice dos tokens existentes. A última vetorização só é reaproveitada se
+    as entradas já vetorizadas continuarem as mesmas, na mesma ordem (ver
+    DatasetStore.fingerprint).
+
+    Ao contrário da vetorização completa, que mantém os `max_features` tokens
+    mais frequentes, o modo incremental mantém os primeiros tokens encontrados:
+    o vocabulário depende da ordem em que as entradas foram inseridas.
 
     Parâmetros
     ----------
+    store: DatasetStore
+        Banco de dados do modelo
     max_features: int
         Quantidade máxima de tokens a serem utilizados
-    test_size: float
-        Tamanho do conjunto de teste
-    export: bool
-        Flag para exportar o modelo
+    incremental: bool
+        Flag para reaproveitar a última vetorização
 
     Retorna
     -------
-    (DecisionTreeClassifier, CountVectorizer)
+    (scipy.sparse.csr_matrix, np.ndarray, CountVectorizer, int)
+        Matriz, saídas, vetorizador e quantidade de entradas vetorizadas nesta chamada
     """
 
-    # Carregando banco de dados
-    model_data = pd.read_feather(r'assets\model\model_data.feather')
-    x = model_data['input'].to_numpy()
+    model_data = store.read()
     y = model_data['output'].to_numpy()
 
-    # Vetorização
-    vectorizer = CountVectorizer(max_features=max_features, stop_words=[''])
-    x = vectorizer.fit_transform(x).toarray().astype(np.int8)
+    # Reaproveitando a última vetorização, se o banco de dados apenas recebeu novas entradas
+    cache = None
+    if incremental and os.path.exists('assets/model/features.npz'):
+        with open('assets/model/features.json', 'r') as file:
+            cache = json.load(file)
+        if cache['rows'] > len(model_data) or cache.get('fingerprint') != store.fingerprint(cache['rows']):
+            cache = None
+
+    if cache is None:
+        vectorizer = CountVectorizer(max_features=max_features, stop_words=[''])
+        x = vectorizer.fit_transform(model_data['input']).tocsr()
+        vocabulary = vectorizer.vocabulary_
+        new_rows = len(model_data)
+    else:
+        vocabulary = cache['vocabulary']
+        new_inputs = model_data['input'].iloc[cache['rows']:]
+        new_rows = len(new_inputs)
+
+        # Tokens novos no fim do vocabulário
+        analyzer = CountVectorizer(stop_words=['']).build_analyzer()
+        for text in new_inputs:
+            for token in analyzer(text):
+                if token not in vocabulary and len(vocabulary) < max_features:
+                    vocabulary[token] = len(vocabulary)
+
+        vectorizer = CountVectorizer(vocabulary=vocabulary, stop_words=['']).fit([])
+        x = sparse.load_npz('assets/model/features.npz').tocsr()
+        x.resize((x.shape[0], len(vocabulary)))
+        if new_rows:
+            x = sparse.vstack([x, vectorizer.transform(new_inputs)], format='csr')
+
+    # Salvando a vetorização para o próximo treinamento incremental
+    sparse.save_npz('assets/model/features.npz', x)
+    with open('assets/model/features.json', 'w') as file:
+        json.dump({'fingerprint': store.fingerprint(len(model_data)),
+                   'rows': len(model_data),
+                   'vocabulary': {token: int(n) for token, n in vocabulary.items()}}, file)
+
+    return (x, y, vectorizer, new_rows)
+
+
+def train_model(max_features: int = 1000, test_size: float = 0.2, export: bool = False, incremental: bool = False) -> tuple:
+    """
+    Treina o modelo com os dados coletados do banco de dados
 
-    # Divisão treino | teste
-    x_train, x_test, y_train, y_test = train_test_split(
-        x, y, test_size=test_size, random_state=10)
+    Parâmetros
+    ----------
+    max_features: int
+        Quantidade máxima de tokens a serem utilizados
+    test_size: float
+        Tamanho do conjunto de teste. Se 0, o modelo não é avaliado.
+    export: bool
+        Flag para exportar o modelo
+    incremental: bool
+        Flag para vetorizar apenas as entradas novas do banco de dados (ver vectorize)
 
-    # Treinamento do modelo
-    classification_model = DecisionTreeClassifier(random_state=10)
-    classification_model.fit(x_train, y_train)
+    Retorna
+    -------
+    (DecisionTreeClassifier, CountVectorizer)
+    """
 
-    # Score
-    logger.info(f'Score: {classification_model.score(x_test, y_test):.2f}')
+    tracemalloc.start()
+    start = perf_counter()
+    try:
+        # Vetorização
+        x, y, vectorizer, new_rows = vectorize(DatasetStore(), max_features, incremental)
+
+        # Avaliação: divisão treino | teste
+        score = None
+        if test_size > 0:
+            x_train, x_test, y_train, y_test = train_test_split(
+                x, y, test_size=test_size, random_state=10)
+            classification_model = DecisionTreeClassifier(random_state=10)
+            classification_model.fit(x_train, y_train)
+            score = classification_model.score(x_test, y_test)
+            logger.info(f'Score: {score:.2f}')
+
+        # Treinamento do modelo final com todos os dados
+        if export or test_size == 0:
+            classification_model = DecisionTreeClassifier(random_state=10)
+            classification_model.fit(x, y)
+
+        seconds = perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    logger.info(
+        f'Treinamento: {seconds:.1f}s, pico de memória de {peak/1e6:.1f} MB ({new_rows} entradas vetorizadas).')
 
     # Exportando modelo
     if export:
-        classification_model.fit(x, y)
-
         backup('assets/model/model.pkl')
         backup('assets/model/vectorizer.pkl')
 
         pickle.dump(classification_model, open(
-            r'assets\model\model.pkl', 'wb'))
-        pickle.dump(vectorizer, open(r'assets\model\vectorizer.pkl', 'wb'))
+            'assets/model/model.pkl', 'wb'))
+        pickle.dump(vectorizer, open('assets/model/vectorizer.pkl', 'wb'))
+        export_compact(classification_model, vectorizer)
+
+        # Histórico de versões do modelo
+        history = []
+        if os.path.exists('assets/model/model_info.json'):
+            with open('assets/model/model_info.json', 'r') as file:
+                history = json.load(file)
+        history.append({'date': datetime.now().isoformat(timespec='seconds'),
+                        'rows': int(x.shape[0]),
+                        'new_rows': int(new_rows),
+                        'features': int(x.shape[1]),
+                        'incremental': incremental,
+                        'score': score,
+                        'train_seconds': round(seconds, 3),
+                        'peak_memory_mb': round(peak / 1e6, 2)})
+        with open('assets/model/model_info.json', 'w') as file:
+            json.dump(history, file, indent=1)
         logger.success('Modelo salvo com sucesso.')
 
     return (classification_model, vectorizer)
@@ -70,23 +178,84 @@ def train_model(max_features: int = 1000, test_size: float = 0.2, export: bool =
 # ─── Manipulação Do Banco De Dados Do Modelo ──────────────────────────────────
 
 
-def variate_input(user_input: str, database: dict) -> tuple:
+# Alternativas de cada token, memorizadas por dicionário de variações de pronúncia
+_alternatives = {}
+
+
+def token_alternatives(token: str, mistakes: dict) -> tuple:
     """
-    Retorna as variantes possíveis para o input do usuário
+    Retorna as alternativas de um token: o próprio token e suas variações de pronúncia.
+
+    Parâmetros
+    ----------
+    token: str
+        Palavra do input
+    mistakes: dict
+        Variações de pronúncia (database['mistakes'])
+
+    Retorna
+    -------
+    tuple
     """
-    variants = [user_input]
-    for mistake in list(database['mistakes'].keys()):
-        if mistake in user_input.split(' '):
-            for variant in database['mistakes'][mistake]:
-                variants.extend(variate_input(
-                    user_input.replace(mistake, variant), database))
 
-    return variants
+    memo = _alternatives.get(id(mistakes))
+    if memo is None or memo[0] is not mistakes:
+        memo = _alternatives[id(mistakes)] = (mistakes, {})
+
+    alternatives = memo[1].get(token)
+    if alternatives is None:
+        variants = mistakes.get(token) or []
+        alternatives = tuple(dict.fromkeys([token, *variants]))
+        memo[1][token] = alternatives
+    return alternatives
 
 
-def generate_variants(inputs: list, outputs: list, database: dict, command: str = 'counters') -> tuple:
+def variate_input(user_input: str, database: dict, limit: int | None = None, sample: float | None = None, seed: int = 10):
     """
-    Retorna as variantes possíveis para os inputs.
+    Gera as variantes possíveis para o input do usuário.
+
+    As variantes são o produto cartesiano das alternativas de cada token,
+    geradas sob demanda e sem repetições. A primeira variante é sempre o
+    próprio input.
+
+    Parâmetros
+    ----------
+    user_input: str
+        Input do usuário
+    database: dict
+        Dicionário com as informações do banco de dados
+    limit: int | None
+        Quantidade máxima de variantes geradas
+    sample: float | None
+        Fração (0 a 1) das variantes mantidas, sorteadas de forma determinística pela semente
+    seed: int
+        Semente da amostragem
+
+    Retorna
+    -------
+    Generator[str]
+    """
+
+    alternatives = [token_alternatives(token, database['mistakes'])
+                    for token in user_input.split(' ')]
+
+    rng = random.Random(seed)
+    seen = set()
+    for n, combination in enumerate(product(*alternatives)):
+        if sample is not None and n > 0 and rng.random() > sample:
+            continue
+        variant = ' '.join(combination)
+        if variant in seen:
+            continue
+        seen.add(variant)
+        yield variant
+        if limit is not None and len(seen) >= limit:
+            return
+
+
+def iter_variants(inputs: list, outputs: list, database: dict, command: str = 'counters', limit: int | None = None, sample: float | None = None):
+    """
+    Gera, sob demanda, os pares (input, output) com as variantes possíveis para os inputs.
 
     Parâmetros
     ----------
@@ -96,25 +265,26 @@ def generate_variants(inputs: list, outputs: list, database: dict, command: str
         Lista com outputs de nomes dos campeões
     database: dict
         Dicionário com as informações do banco de dados
+    command: str
+        Comando das variantes (counters, spells ou draft)
+    limit: int | None
+        Quantidade máxima de variantes por input (ver variate_input)
+    sample: float | None
+        Fração das variantes mantidas (ver variate_input)
 
     Retorna
     -------
-    (list, list)
+    Generator[(str, str)]
     """
 
-    # Inserindo variantes possíveis
-    x = []
-    y = []
-    if command == 'counters':
+    if command in ('counters', 'draft'):
         for n, user_input in enumerate(inputs):
             for role in database['roles']:
-                new_input = f'counters {user_input} {role}'
-                output = f'counters {outputs[n]} {role}'
+                new_input = f'{command} {user_input} {role}'
+                output = f'{command} {outputs[n]} {role}'
 
-                var_x = variate_input(new_input, database)
-                output = [output] * len(var_x)
-                x.extend(var_x)
-                y.extend(output)
+                for variant in variate_input(new_input, database, limit, sample):
+                    yield (variant, output)
 
     elif command == 'spells':
         for n, user_input in enumerate(inputs):
@@ -122,37 +292,47 @@ def generate_variants(inputs: list, outputs: list, database: dict, command: str
                 new_input = f'{user_input} {role}'
                 output = f'spell {outputs[n]} {role}'
 
-                x.append(new_input)  # Entrada do usuário
-                y.append(output)  # Saída do algoritmo
-                x.append(' '.join(output.split(' ')[1:]))  # Entrada ideal
-                y.append(output)  # Saída do algoritmo
+                yield (new_input, output)  # Entrada do usuário
+                yield (' '.join(output.split(' ')[1:]), output)  # Entrada ideal
 
                 for mistake in list(database['mistakes'].keys()):
                     if mistake in new_input:
                         for variant in database['mistakes'][mistake]:
-                            x.append(new_input.replace(mistake, variant))
-                            y.append(output)
-    
-    elif command == 'draft':
-        for n, user_input in enumerate(inputs):
-            for role in database['roles']:
-                new_input = f'draft {user_input} {role}'
-                output = f'draft {outputs[n]} {role}'
+                            yield (new_input.replace(mistake, variant), output)
+
+
+def generate_variants(inputs: list, outputs: list, database: dict, command: str = 'counters', limit: int | None = None, sample: float | None = None) -> tuple:
+    """
+    Retorna as variantes possíveis para os inputs.
+
+    Parâmetros
+    ----------
+    Mesmos de iter_variants
+
+    Retorna
+    -------
+    (list, list)
+    """
 
-                var_x = variate_input(new_input, database)
-                output = [output] * len(var_x)
-                x.extend(var_x)
-                y.extend(output)
+    x = []
+    y = []
+    for variant, output in iter_variants(inputs, outputs, database, command, limit, sample):
+        x.append(variant)
+        y.append(output)
 
     return (x, y)
 
 
 def populate_model_data() -> None:
+    """
+    Insere no banco de dados do modelo as variantes de todos os nomes já coletados
+    """
     # Carregando banco de dados
-    database = load_data()
+    database = registry.get('database')
+    store = DatasetStore()
 
     # Carregando banco de dados do modelo
-    model_data = pd.read_feather(r'assets\model\model_data.feather')
+    model_data = store.read()
 
     # Inserindo dados no banco de dados
     df = model_data[['input_name', 'output_name']].copy()
@@ -160,17 +340,9 @@ def populate_model_data() -> None:
     df.drop_duplicates(inplace=True, ignore_index=True)
     inputs, outputs = df['input_name'], df['output_name']
 
-    x = []
-    y = []
     for command in ['counters', 'draft']:
-        temp_x, temp_y = generate_variants(
-            inputs, outputs, database, command
-        )
-        x.extend(temp_x)
-        y.extend(temp_y)
+        ingest(iter_variants(inputs, outputs, database, command), store)
 
-    # Exportando dados
-    export_txt(x, y)
     logger.success('Dados coletados e salvos com sucesso!')
 
 
@@ -178,50 +350,39 @@ def store_data() -> None:
     """
     Salva os dados recentemente coletados no banco de dados do modelo
     """
-    # Formatando dados
-    df = pd.DataFrame(columns=['input', 'output'])
-    with open(r'assets\texts\input.txt', 'r', encoding='utf-8') as file:
-        df['input'] = [command.replace('\n', '')
-                       for command in file.readlines()]
-    with open(r'assets\texts\output.txt', 'r', encoding='utf-8') as file:
-        df['output'] = [command.replace('\n', '')
-                        for command in file.readlines()]
-    df['input_name'] = df['input'].apply(
-        lambda x: ' '.join(x.split(' ')[1:-1]))
-    df['output_name'] = df['output'].apply(
-        lambda x: ' '.join(x.split(' ')[1:-1]))
-    df['score'] = df.apply(lambda x: SequenceMatcher(
-        None, x['input_name'], x['output_name']).ratio(), axis=1)
-
-    # Backup dos dados
-    backup('assets/model/model_data.feather')
-
-    # Agrupando dados
-    model_data = pd.read_feather(r'assets\model\model_data.feather')
-    length = len(model_data)
-    df = pd.concat([model_data, df], ignore_index=True)
-
-    # Removendo duplicados
-    df = df.drop_duplicates()
-    length = len(df) - length
-    logger.info(
-        f'Foram adicionadas {length} novas entradas ao banco de dados do modelo.')
+    with open('assets/texts/input.txt', 'r', encoding='utf-8') as file:
+        inputs = file.read().splitlines()
+    with open('assets/texts/output.txt', 'r', encoding='utf-8') as file:
+        outputs = file.read().splitlines()
 
-    # Exportando dados
-    df = df.reset_index(drop=True)
-    df.to_feather(r'assets\model\model_data.feather')
+    # Apenas as entradas novas são gravadas
+    store = DatasetStore()
+    store.backup()
+    ingest(zip(inputs, outputs), store)
 
 
-def data_analysis(ignore: list | None, threshold: float = 0.2) -> None:
+def data_analysis(ignore: list | None, threshold: float = 0.2, metric: str = 'sequence') -> None:
     """
     Analisa os dados coletados, removendo entradas com pouca semelhança com os nomes esperados
+
+    Parâmetros
+    ----------
+    ignore: list | None
+        Nomes esperados que não devem ser analisados
+    threshold: float
+        Score mínimo de semelhança
+    metric: str
+        Métrica de semelhança: 'sequence' (score armazenado), 'edit', 'phonetic' ou 'ngram'
     """
 
     # Carregando banco de dados
-    df = pd.read_feather(r'assets\model\model_data.feather')
+    store = DatasetStore()
+    df = store.read()
 
     # Filtrando scores baixos
-    low_score = df.query(f'score < {threshold} & output_name not in @ignore')
+    scores = df['score'] if metric == 'sequence' else score_pairs(
+        df['input_name'], df['output_name'], metric)
+    low_score = df[(scores < threshold) & ~df['output_name'].isin(ignore or [])]
     if len(low_score) == 0:
         logger.info('Nenhuma entrada com scores baixos encontrada.')
         return
@@ -241,8 +402,7 @@ def data_analysis(ignore: list | None, threshold: float = 0.2) -> None:
         # Todo: Backup
 
         # Exportando dados
-        df = df.reset_index(drop=True)
-        df.to_feather(r'assets\model\model_data.feather')
+        store.rewrite(df.reset_index(drop=True))
 
         # Reinserindo dados
         user = input(
@@ -259,10 +419,10 @@ def export_data() -> None:
     """
 
     # Carregar banco de dados
-    model_data = pd.read_feather(r'assets\model\model_data.feather')
+    model_data = DatasetStore().read()
 
     # Exportar dados
-    model_data.to_excel(r'assets\model\model_data.xlsx')
+    model_data.to_excel('assets/model/model_data.xlsx')
 
 
 def export_txt(x: list, y: list) -> None:
@@ -281,14 +441,14 @@ def export_txt(x: list, y: list) -> None:
     None
     """
 
-    with open(r'assets\texts\input.txt', 'w', encoding='utf-8') as file:
+    with open('assets/texts/input.txt', 'w', encoding='utf-8') as file:
         for n, user_input in enumerate(x):
             if n != len(x) - 1:
                 file.write(user_input + '\n')
             else:
                 file.write(user_input)
 
-    with open(r'assets\texts\output.txt', 'w', encoding='utf-8') as file:
+    with open('assets/texts/output.txt', 'w', encoding='utf-8') as file:
         for n, output in enumerate(y):
             if n != len(y) - 1:
                 file.write(output + '\n')
@@ -303,20 +463,20 @@ def collect_data_spells(repeat: int = 5) -> None:
     Função utilizada para coletar dados para o modelo (função Spells).
     """
     # Carregando banco de dados
-    database = load_data()
+    database = registry.get('database')
     spells = list(database['spells'].keys())
 
     # Obtendo nomes das spells
     inputs = []
     outputs = []
     r = sr.Recognizer()
+    cue = create_backends().cue
     while len(spells) > 0:
         repetition = 0
         spell = spells.pop(0)
         with sr.Microphone() as source:
             while repetition < repeat:
-                winsound.PlaySound(
-                    'assets\\sounds\\listening.wav', winsound.SND_NOSTOP)
+                cue.play('listening')
                 logger.info(
                     f'[Repetição {repetition+1}/{repeat}]: Diga "{spell}" + top|mid|jungle|adc|support')
                 audio = r.listen(source)
@@ -350,7 +510,7 @@ def collect_data_counters(start: int | str, stop: int = 5, repeat: int = 5) -> N
     """
 
     # Carregar banco de dados
-    database = load_data()
+    database = registry.get('database')
     champions = database['champions']
 
     # Converter nome do campeão para id
@@ -362,12 +522,12 @@ def collect_data_counters(start: int | str, stop: int = 5, repeat: int = 5) -> N
     outputs = []
     iteration = 0
     r = sr.Recognizer()
+    cue = create_backends().cue
     while iteration < stop:
         repetition = 0
         with sr.Microphone() as source:
             while repetition < repeat:
-                winsound.PlaySound(
-                    'assets\\sounds\\listening.wav', winsound.SND_NOSTOP)
+                cue.play('listening')
                 logger.info(
                     f'[Repetição {repetition+1}/{repeat}]: Diga "counters {champions[iteration+start]} top"')
                 audio = r.listen(source, timeout=6)
@@ -404,7 +564,7 @@ def insert_data_counters() -> None:
     """
 
     # Carregar banco de dados
-    database = load_data()
+    database = registry.get('database')
     champions = database['champions']
 
     inputs = []
@@ -428,14 +588,14 @@ def insert_data_counters() -> None:
     x, y = generate_variants(inputs, outputs, database, 'counters')
 
     # Salvando resultados em arquivo txt para posterior visualização
-    with open(r'assets\texts\input.txt', 'w', encoding='utf-8') as file:
+    with open('assets/texts/input.txt', 'w', encoding='utf-8') as file:
         for n, user_input in enumerate(x):
             if n != len(x) - 1:
                 file.write(user_input + '\n')
             else:
                 file.write(user_input)
 
-    with open(r'assets\texts\output.txt', 'w', encoding='utf-8') as file:
+    with open('assets/texts/output.txt', 'w', encoding='utf-8') as file:
         for n, output in enumerate(y):
             if n != len(y) - 1:
                 file.write(output + '\n')
@@ -454,7 +614,7 @@ def collect_data_draft(start: int | str, stop: int = 5, repeat: int = 5) -> None
     """
 
     # Carregar banco de dados
-    database = load_data()
+    database = registry.get('database')
     champions = database['champions']
 
     # Converter nome do campeão para id
@@ -466,12 +626,12 @@ def collect_data_draft(start: int | str, stop: int = 5, repeat: int = 5) -> None
     outputs = []
     iteration = 0
     r = sr.Recognizer()
+    cue = create_backends().cue
     while iteration < stop:
         repetition = 0
         with sr.Microphone() as source:
             while repetition < repeat:
-                winsound.PlaySound(
-                    'assets\\sounds\\listening.wav', winsound.SND_NOSTOP)
+                cue.play('listening')
                 logger.info(
                     f'[Repetição {repetition+1}/{repeat}]: Diga "draft {champions[iteration+start]} top"')
                 audio = r.listen(source, timeout=6)
@@ -1,30 +1,29 @@
-import winsound
-
 import speech_recognition as sr
+from backends import create_backends
 from load import *
 from loguru import logger
-import numpy as np
+from recognizer import create_recognizer
 
 def user_input_test() -> None:
     """
     Função utilizada para testar a resposta do modelo aos comandos de voz.
     """
 
-    model, vectorizer = load_model()
+    classifier = load_classifier()
+    cue = create_backends().cue
 
     r = sr.Recognizer()
+    recognizer = create_recognizer(load_data(), r)
     while True:
         with sr.Microphone() as source:
-            winsound.PlaySound(
-                'assets\\sounds\\listening.wav', winsound.SND_NOSTOP)
+            cue.play('listening')
             logger.info('Aguardando comando...')
             audio = r.listen(source)
         try:
-            command = r.recognize_google(audio, language="pt-BR").lower()
+            command = recognizer.recognize(audio)
             if 'encerrar' in command:
                 break
-            command = vectorizer.transform([command.lower()]).toarray().astype(np.int8)
-            logger.info(f'Comando interpretado: {model.predict(command)}')
+            logger.info(f'Comando interpretado: {classifier.predict(command)}')
         except:
             logger.error('Ocorreu um erro. Tente novamente.')
 
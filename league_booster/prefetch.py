@@ -0,0 +1,118 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import monotonic, sleep
+
+from draft_commands import UGG_URL, cache, create_session, fetch_counters
+from load import load_data
+from log import create_logfile
+from loguru import logger
+
+
+class RateLimiter:
+    """
+    Limita a quantidade de requisições por segundo, de forma compartilhada entre threads.
+
+    Parâmetros:
+    -----------
+    rate: float
+        Quantidade máxima de requisições por segundo
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate
+        self._next = monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """
+        Aguarda até que a próxima requisição seja permitida.
+        """
+
+        with self._lock:
+            now = monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            sleep(slot - now)
+
+
+def prefetch(database: dict, workers: int = 4, rate: float = 5.0, base_url: str = UGG_URL) -> dict:
+    """
+    Pré-carrega no cache os counters de todos os campeões, em todas as roles.
+
+    Entradas já presentes no cache são ignoradas, permitindo retomar um
+    pré-carregamento interrompido.
+
+    Parâmetros:
+    -----------
+    database: dict
+        Banco de dados do algoritmo
+    workers: int
+        Quantidade máxima de requisições simultâneas
+    rate: float
+        Quantidade máxima de requisições por segundo
+    base_url: str
+        Endereço base do site (permite utilizar um servidor local de testes)
+
+    Retorna:
+    --------
+    dict:
+        Resumo do pré-carregamento (baixados, falhas, ignorados e duração)
+    """
+
+    region, patch = database['region'], database['patch']
+
+    # Retomando: ignorando entradas já armazenadas
+    pending = [(champion, role)
+               for champion in database['champions']
+               for role in database['roles']
+               if not cache.contains(champion, role, region, patch)]
+    skipped = len(database['champions']) * len(database['roles']) - len(pending)
+    logger.info(
+        f'Pré-carregamento: {len(pending)} consultas pendentes, {skipped} já em cache.')
+
+    limiter = RateLimiter(rate)
+    session = create_session(workers)
+
+    def task(champion: str, role: str) -> None:
+        limiter.wait()
+        data = fetch_counters(champion, role, region, session, base_url)
+        cache.set(champion, role, region, patch, data)
+
+    fetched = failed = 0
+    start = last_report = monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(task, champion, role): (champion, role)
+                   for champion, role in pending}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                fetched += 1
+            except Exception as e:
+                failed += 1
+                champion, role = futures[future]
+                logger.warning(
+                    f'Falha ao obter counters de {champion} {role}: {e}')
+
+            # Relatório de progresso
+            now = monotonic()
+            if now - last_report >= 5 or fetched + failed == len(pending):
+                last_report = now
+                throughput = (fetched + failed) / max(now - start, 1e-9)
+                logger.info(
+                    f'Pré-carregamento: {fetched + failed}/{len(pending)} ({throughput:.1f} consultas/s)')
+
+    session.close()
+    elapsed = monotonic() - start
+    logger.success(
+        f'Pré-carregamento concluído em {elapsed:.1f}s: {fetched} baixados, {failed} falhas.')
+
+    return {'fetched': fetched,
+            'failed': failed,
+            'skipped': skipped,
+            'seconds': elapsed}
+
+
+if __name__ == '__main__':
+    create_logfile()
+    prefetch(load_data())
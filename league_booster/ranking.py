@@ -0,0 +1,120 @@
+import heapq
+from typing import NamedTuple
+
+import numpy as np
+
+
+class RankedOption(NamedTuple):
+    """
+    Opção classificada em um ranking.
+    """
+
+    position: int
+    option: str
+    score: float
+
+
+class Ranking(tuple):
+    """
+    Resultado de uma seleção parcial: as k melhores opções, em ordem.
+    """
+
+    __slots__ = ()
+
+    def display(self, offset: float = 0, suffix: str = '') -> None:
+        """
+        Mostra as opções do ranking.
+
+        Parâmetros:
+        -----------
+        offset: float
+            Valor somado aos scores exibidos
+        suffix: str
+            Texto exibido após cada score
+        """
+
+        for position, option, score in self:
+            print(f'[{position}º] {option}: {round(score + offset, 2)}{suffix}')
+
+    def to_dict(self) -> dict:
+        """
+        Converte o ranking em um dicionário ordenado (opção -> score).
+        """
+
+        return {option: score for _, option, score in self}
+
+
+def rank(scores: dict, k: int | None = 10, tie_break=None) -> Ranking:
+    """
+    Seleciona as k opções de maior score, sem ordenar todas as opções.
+
+    Parâmetros:
+    -----------
+    scores: dict
+        Dicionário de opção -> score
+    k: int | None
+        Quantidade de opções selecionadas. Se None, todas as opções são ordenadas.
+    tie_break: callable | None
+        Chave de desempate aplicada à opção (em ordem crescente).
+        Se None, o desempate é feito pela ordem alfabética da opção.
+
+    Retorna:
+    --------
+    Ranking
+    """
+
+    tie_break = tie_break or (lambda option: option)
+    key = lambda item: (-item[1], tie_break(item[0]))
+
+    if k is None or k >= len(scores):
+        selected = sorted(scores.items(), key=key)
+    else:
+        selected = heapq.nsmallest(k, scores.items(), key=key)
+
+    return Ranking(RankedOption(n + 1, option, score)
+                   for n, (option, score) in enumerate(selected))
+
+
+def rank_array(options: list, scores: np.ndarray, k: int | None = 10, priority: np.ndarray | None = None) -> Ranking:
+    """
+    Seleciona as k opções de maior score a partir de arrays, através de seleção parcial.
+
+    Parâmetros:
+    -----------
+    options: list
+        Nome das opções, alinhado com os scores
+    scores: np.ndarray
+        Scores das opções
+    k: int | None
+        Quantidade de opções selecionadas. Se None, todas as opções são ordenadas.
+    priority: np.ndarray | None
+        Critério que precede o score na ordenação (ex.: quantidade de inimigos countereados).
+        O desempate final é feito pela ordem das opções.
+
+    Retorna:
+    --------
+    Ranking
+    """
+
+    scores = np.asarray(scores, dtype=np.float64)
+    n = len(scores)
+    k = n if k is None else min(k, n)
+    if k == 0:
+        return Ranking()
+
+    # Critério único de ordenação: prioridade e, dentro dela, o score
+    key = scores
+    if priority is not None:
+        key = np.asarray(priority) * (np.ptp(scores) + 1) + (scores - scores.min())
+
+    # Seleção parcial: todas as opções empatadas no limite do top k são
+    # mantidas, para que o desempate pela ordem das opções seja determinístico
+    if k == n:
+        candidates = np.arange(n)
+    else:
+        cutoff = np.partition(-key, k - 1)[k - 1]
+        candidates = np.flatnonzero(-key <= cutoff)
+    selected = candidates[np.lexsort((candidates, -key[candidates]))][:k]
+
+    return Ranking(RankedOption(position + 1, options[i], float(scores[i]))
+                   for position, i in enumerate(selected))
@@ -0,0 +1,191 @@
+import glob
+import json
+import os
+import wave
+
+import speech_recognition as sr
+from loguru import logger
+
+# Formato de áudio utilizado pelos reconhecedores offline
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+
+class GoogleRecognizer:
+    """
+    Reconhecimento de fala online (Google), através do speech_recognition.
+
+    O áudio é enviado somente após o fim da fala, portanto não há resultados parciais.
+
+    Parâmetros:
+    -----------
+    r: sr.Recognizer
+        Objeto de reconhecimento de fala
+    language: str
+        Idioma do reconhecimento
+    """
+
+    streaming = False
+
+    def __init__(self, r: sr.Recognizer, language: str = 'pt-BR') -> None:
+        self.r = r
+        self.language = language
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        return self.r.recognize_google(audio, language=self.language).lower()
+
+    def stream(self, frames):
+        audio = sr.AudioData(b''.join(frames), SAMPLE_RATE, SAMPLE_WIDTH)
+        yield self.recognize(audio), True
+
+
+class VoskRecognizer:
+    """
+    Reconhecimento de fala offline (Vosk), restrito ao vocabulário do banco de
+    dados: comandos, campeões, spells e roles.
+
+    O áudio é processado em blocos à medida que é capturado e os resultados
+    parciais são emitidos durante a fala.
+
+    Parâmetros:
+    -----------
+    model_path: str
+        Pasta do modelo do Vosk (ex.: vosk-model-small-pt-0.3)
+    database: dict
+        Banco de dados do algoritmo
+    """
+
+    streaming = True
+
+    def __init__(self, model_path: str, database: dict) -> None:
+        import vosk
+
+        vosk.SetLogLevel(-1)
+        self.model = vosk.Model(model_path)
+        self.grammar = json.dumps(grammar(database) + ['[unk]'])
+        self._vosk = vosk
+
+    def _recognizer(self):
+        return self._vosk.KaldiRecognizer(self.model, SAMPLE_RATE, self.grammar)
+
+    def recognize(self, audio: sr.AudioData) -> str:
+        recognizer = self._recognizer()
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=SAMPLE_RATE,
+                                                     convert_width=SAMPLE_WIDTH))
+        text = json.loads(recognizer.FinalResult())['text']
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+    def stream(self, frames):
+        """
+        Reconhece um fluxo de blocos de áudio (PCM 16 kHz, 16 bits, mono).
+
+        Retorna:
+        --------
+        Iterator[tuple]:
+            Pares (texto, final): hipóteses parciais durante a fala e o
+            resultado final, emitido ao fim da primeira fala
+        """
+
+        recognizer = self._recognizer()
+        partial = ''
+        for frame in frames:
+            # Fim da fala detectado pelo Vosk: resultado final
+            if recognizer.AcceptWaveform(frame):
+                text = json.loads(recognizer.Result())['text']
+                if text:
+                    yield text, True
+                    return
+                continue
+            text = json.loads(recognizer.PartialResult())['partial']
+            if text and text != partial:
+                partial = text
+                yield text, False
+        yield json.loads(recognizer.FinalResult())['text'] or partial, True
+
+
+def grammar(database: dict) -> list:
+    """
+    Vocabulário aceito pelo reconhecimento offline.
+    """
+
+    words = ['counters', 'draft', 'time', 'team', 'encerrar']
+    words += list(database['champions']) + list(database['spells']) + list(database['roles'])
+
+    # Variações de pronúncia, já tratadas pelo resolvedor
+    for variants in database['mistakes'].values():
+        words += [word for variant in variants for word in str(variant).split()]
+    return sorted(set(words))
+
+
+def create_recognizer(database: dict, r: sr.Recognizer):
+    """
+    Cria o reconhecedor de fala configurado (database.yaml: recognizer e vosk_model).
+    """
+
+    if database['recognizer'] == 'vosk':
+        return VoskRecognizer(database['vosk_model'], database)
+    return GoogleRecognizer(r)
+
+
+# ─── Fontes De Áudio ──────────────────────────────────────────────────────────
+
+
+def wav_frames(path: str, chunk: int = 4000):
+    """
+    Blocos de áudio de um arquivo WAV (PCM 16 kHz, 16 bits, mono), ex.: gravações de teste.
+    """
+
+    with wave.open(path, 'rb') as file:
+        while frame := file.readframes(chunk):
+            yield frame
+
+
+def transcribe(recognizer, frames, done=None) -> str:
+    """
+    Reconhece um fluxo de áudio, encerrando a captura assim que `done` aceitar
+    uma hipótese parcial (ex.: comando completo reconhecido pelo resolvedor).
+
+    Parâmetros:
+    -----------
+    recognizer: GoogleRecognizer | VoskRecognizer
+        Reconhecedor de fala
+    frames: Iterable[bytes]
+        Blocos de áudio
+    done: callable | None
+        Função que recebe uma hipótese parcial e retorna True para encerrar a captura
+
+    Retorna:
+    --------
+    str:
+        Texto reconhecido
+    """
+
+    text = ''
+    for text, final in recognizer.stream(frames):
+        logger.debug(f'Reconhecimento {"final" if final else "parcial"}: {text}')
+        if not final and done is not None and done(text):
+            break
+    if not text:
+        raise sr.UnknownValueError()
+    return text
+
+
+if __name__ == '__main__':
+    # Gravações de teste: o nome de cada arquivo é o texto esperado (ex.: "counters ahri mid.wav")
+    from load import load_data
+
+    database = load_data()
+    recognizer = create_recognizer(database, sr.Recognizer())
+    paths = sorted(glob.glob('assets/fixtures/audio/*.wav'))
+    correct = 0
+    for path in paths:
+        expected = os.path.splitext(os.path.basename(path))[0]
+        try:
+            text = transcribe(recognizer, wav_frames(path))
+        except sr.UnknownValueError:
+            text = ''
+        correct += text == expected
+        logger.info(f'{expected} -> {text}')
+    logger.info(f'Acertos: {correct}/{len(paths)}')
@@ -0,0 +1,97 @@
+import os
+import threading
+from time import monotonic, perf_counter
+
+from load import load_data, load_json
+from loguru import logger
+
+
+class AssetRegistry:
+    """
+    Registro de arquivos de dados, carregados sob demanda uma única vez por processo.
+
+    Cada arquivo é recarregado automaticamente quando sua data de modificação
+    muda. Para evitar acessos ao disco no caminho crítico, a data de modificação
+    é verificada no máximo uma vez a cada `check_interval` segundos (inclusive
+    para arquivos ainda inexistentes).
+
+    Parâmetros:
+    -----------
+    check_interval: float
+        Intervalo mínimo, em segundos, entre verificações de modificação
+    """
+
+    def __init__(self, check_interval: float = 1.0) -> None:
+        self.check_interval = check_interval
+        self.timings = {}
+        self._assets = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, path: str, loader) -> None:
+        """
+        Registra um arquivo de dados.
+
+        Parâmetros:
+        -----------
+        name: str
+            Nome do arquivo no registro
+        path: str
+            Caminho do arquivo
+        loader: callable
+            Função que recebe o caminho e retorna os dados carregados
+        """
+
+        with self._lock:
+            self._assets[name] = {'path': path, 'loader': loader,
+                                  'value': None, 'mtime': None, 'checked': None,
+                                  'missing': False}
+
+    def get(self, name: str):
+        """
+        Retorna os dados de um arquivo, carregando-o se necessário.
+
+        Gera FileNotFoundError se o arquivo não existir.
+        """
+
+        asset = self._assets[name]
+        now = monotonic()
+        if asset['checked'] is not None and now - asset['checked'] < self.check_interval:
+            if asset['missing']:
+                raise FileNotFoundError(f'Arquivo "{asset["path"]}" não encontrado.')
+            return asset['value']
+
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(asset['path'])
+            except FileNotFoundError:
+                asset['missing'], asset['checked'] = True, now
+                raise
+            asset['missing'] = False
+            if mtime != asset['mtime']:
+                start = perf_counter()
+                asset['value'] = asset['loader'](asset['path'])
+                self.timings[name] = perf_counter() - start
+                if asset['mtime'] is not None:
+                    logger.info(f'Arquivo "{asset["path"]}" recarregado.')
+                asset['mtime'] = mtime
+            asset['checked'] = now
+
+        return asset['value']
+
+    def warm_up(self) -> None:
+        """
+        Carrega todos os arquivos registrados e registra os tempos de carregamento no log.
+        """
+
+        for name, asset in list(self._assets.items()):
+            if os.path.exists(asset['path']):
+                self.get(name)
+        for name, seconds in self.timings.items():
+            logger.info(f'Arquivo "{name}" carregado em {seconds*1e3:.1f} ms.')
+
+
+# Registro global do processo
+registry = AssetRegistry()
+registry.register('database', 'database.yaml', load_data)
+registry.register('champions', 'assets/draft/champions.json', load_json)
+registry.register('duos', 'assets/draft/duos.json', load_json)
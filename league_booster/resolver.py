@@ -0,0 +1,268 @@
+import unicodedata
+from typing import NamedTuple
+
+# ─── Distância Entre Palavras ─────────────────────────────────────────────────
+
+
+def levenshtein(a: str, b: str) -> int:
+    """
+    Calcula a distância de edição (Levenshtein) entre duas palavras.
+    """
+
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def similarity(a: str, b: str) -> float:
+    """
+    Similaridade entre duas palavras, de 0 a 1, baseada na distância de edição.
+    """
+
+    if not a and not b:
+        return 1.0
+    return 1 - levenshtein(a, b) / max(len(a), len(b))
+
+
+def normalize(text: str) -> str:
+    """
+    Remove acentos e converte o texto para minúsculas.
+    """
+
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+# Substituições aplicadas na chave fonética (ordem importa)
+PHONETIC_RULES = [('ph', 'f'), ('ch', 'x'), ('sh', 'x'), ('qu', 'k'), ('ck', 'k'),
+                  ('ce', 'se'), ('ci', 'si'), ('c', 'k'), ('y', 'i'), ('w', 'u'),
+                  ('z', 's'), ('h', '')]
+
+
+def phonetic_key(word: str) -> str:
+    """
+    Gera uma chave fonética simplificada, tolerante às trocas mais comuns do
+    reconhecimento de fala em português (ex.: "lúcia" e "lucian", "cáiça" e "kaisa").
+    """
+
+    key = ''.join(char for char in normalize(word) if char.isalpha())
+    for old, new in PHONETIC_RULES:
+        key = key.replace(old, new)
+
+    # Removendo letras repetidas
+    collapsed = []
+    for char in key:
+        if not collapsed or collapsed[-1] != char:
+            collapsed.append(char)
+    return ''.join(collapsed)
+
+
+# ─── Índice De Nomes ──────────────────────────────────────────────────────────
+
+
+class BKTree:
+    """
+    Árvore BK: índice de palavras para busca por distância de edição máxima.
+    """
+
+    def __init__(self) -> None:
+        self.root = None
+
+    def add(self, word: str, value: str) -> None:
+        """
+        Adiciona uma palavra ao índice, associada a um valor.
+        """
+
+        if self.root is None:
+            self.root = (word, value, {})
+            return
+        node = self.root
+        while True:
+            distance = levenshtein(word, node[0])
+            if distance == 0:
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (word, value, {})
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> list:
+        """
+        Busca as palavras com distância de edição até `max_distance`.
+
+        Retorna:
+        --------
+        list:
+            Lista de (distância, palavra, valor), em ordem crescente de distância
+        """
+
+        results = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = levenshtein(word, node[0])
+            if distance <= max_distance:
+                results.append((distance, node[0], node[1]))
+            for edge, child in node[2].items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        return sorted(results)
+
+
+# ─── Resolução De Comandos ────────────────────────────────────────────────────
+
+
+class Resolution(NamedTuple):
+    """
+    Comando interpretado pelo resolvedor.
+    """
+
+    command: str | None
+    champion: str | None
+    spell: str | None
+    role: str | None
+    confidence: float
+
+    @property
+    def label(self) -> str | None:
+        """
+        Comando no mesmo formato das saídas do modelo (ex.: "counters ahri top").
+        """
+
+        if self.command == 'spell' and self.spell and self.role:
+            return f'spell {self.spell} {self.role}'
+        if self.command in ('counters', 'draft') and self.champion and self.role:
+            return f'{self.command} {self.champion} {self.role}'
+        return None
+
+
+class Resolver:
+    """
+    Interpreta comandos de voz de forma determinística, a partir dos campeões,
+    roles, spells e variações de pronúncia do banco de dados.
+
+    Novos campeões ou variações passam a ser reconhecidos assim que inseridos
+    no banco de dados, sem necessidade de treinar o modelo novamente.
+
+    Parâmetros:
+    -----------
+    database: dict
+        Banco de dados do algoritmo
+    """
+
+    def __init__(self, database: dict) -> None:
+        # Variações de pronúncia -> palavra correta
+        self.aliases = {}
+        for word, variants in database['mistakes'].items():
+            for variant in variants:
+                self.aliases[normalize(variant)] = word
+
+        self.commands = ['counters', 'draft']
+        self.spells = list(database['spells'])
+        self.roles = list(database['roles'])
+
+        # Índices de campeões: nome exato, chave fonética e árvore BK
+        self.champions = {}
+        self.phonetic = {}
+        self.tree = BKTree()
+        for champion in database['champions']:
+            name = normalize(champion).replace(' ', '')
+            self.champions[name] = champion
+            self.phonetic.setdefault(phonetic_key(name), champion)
+            self.tree.add(name, champion)
+
+        # Resultados de buscas por nome já realizadas
+        self._memo = {}
+
+    def _match(self, word: str, options: list) -> tuple:
+        """
+        Busca a opção mais próxima de uma palavra em uma lista pequena.
+        """
+
+        word = self.aliases.get(word, word)
+        if word in options:
+            return word, 1.0
+
+        key = (word, id(options))
+        if key not in self._memo:
+            self._memo[key] = max(((option, similarity(word, option)) for option in options),
+                                  key=lambda match: match[1])
+        return self._memo[key]
+
+    def _match_champion(self, words: list) -> tuple:
+        """
+        Busca o campeão mais próximo das palavras fornecidas.
+        """
+
+        name = ''.join(words)
+        if not name:
+            return None, 0.0
+        if name in self.champions:
+            return self.champions[name], 1.0
+        if name in self._memo:
+            return self._memo[name]
+        if len(self._memo) > 4096:
+            self._memo.clear()
+        self._memo[name] = result = self._search_champion(name)
+        return result
+
+    def _search_champion(self, name: str) -> tuple:
+        """
+        Busca aproximada de um nome de campeão (chave fonética e distância de edição).
+        """
+
+        # Mesma pronúncia
+        key = phonetic_key(name)
+        if key in self.phonetic:
+            return self.phonetic[key], 0.95
+
+        # Nome mais próximo por distância de edição
+        candidates = self.tree.search(name, max(1, len(name) // 3))
+        if not candidates:
+            return None, 0.0
+        distance, best, champion = candidates[0]
+        return champion, 1 - distance / max(len(name), len(best))
+
+    def resolve(self, text: str) -> Resolution:
+        """
+        Interpreta um comando de voz.
+
+        Parâmetros:
+        -----------
+        text: str
+            Texto reconhecido
+
+        Retorna:
+        --------
+        Resolution:
+            Comando interpretado e a confiança da interpretação (0 a 1)
+        """
+
+        words = normalize(text).split()
+        if len(words) < 2:
+            return Resolution(None, None, None, None, 0.0)
+
+        role, role_confidence = self._match(words[-1], self.roles)
+
+        # Comando de spell: SPELL ROLE
+        command, command_confidence = self._match(words[0], self.commands)
+        spell, spell_confidence = self._match(words[0], self.spells)
+        if spell_confidence > command_confidence:
+            confidence = min(spell_confidence, role_confidence)
+            if len(words) > 2:
+                confidence *= 0.5
+            return Resolution('spell', None, spell, role, confidence)
+
+        # Comandos de counters e draft: COMANDO CAMPEÃO ROLE
+        champion, champion_confidence = self._match_champion(words[1:-1])
+        confidence = min(command_confidence, champion_confidence, role_confidence)
+        return Resolution(command, champion, None, role, confidence)
@@ -0,0 +1,150 @@
+import asyncio
+import sys
+from time import monotonic
+
+from loguru import logger
+from tracing import new_command
+
+# Item da fila que solicita a captura de um comando pelo microfone
+CAPTURE = None
+
+
+class Runtime:
+    """
+    Laço de eventos do assistente: as fontes de entrada (atalho, terminal,
+    testes) inserem itens em uma única fila limitada, consumida por um único
+    processador.
+
+    Cada item é um texto já reconhecido ou CAPTURE (capturar pelo microfone).
+    Itens idênticos a um item já pendente na fila são descartados, de forma
+    que apertar o atalho várias vezes não empilha capturas. Cada item guarda o
+    instante (relógio monotônico) em que foi fornecido, ex.: o pressionamento
+    do atalho, repassado ao processamento do comando.
+
+    Parâmetros:
+    -----------
+    capture: callable
+        Função bloqueante que captura e reconhece um comando (recebe o instante do
+        item e retorna o texto ou None)
+    handle: callable
+        Função que interpreta e despacha um texto reconhecido (recebe o texto e o instante do item)
+    queue_size: int
+        Quantidade máxima de itens pendentes
+    """
+
+    def __init__(self, capture, handle, queue_size: int = 4) -> None:
+        self.capture = capture
+        self.handle = handle
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._pending = set()
+        self._queue = None
+        self._loop = None
+
+    def _offer(self, item, issued: float) -> bool:
+        if item in self._pending:
+            return False
+        if self._queue.full():
+            self.dropped += 1
+            logger.warning('Fila de comandos cheia: comando descartado.')
+            return False
+        self._pending.add(item)
+        self._queue.put_nowait((item, issued))
+        return True
+
+    def submit(self, item=CAPTURE) -> None:
+        """
+        Insere um item na fila a partir de qualquer thread (ex.: callback do teclado),
+        sem bloquear. O item é descartado se a fila estiver cheia.
+        """
+
+        self._loop.call_soon_threadsafe(self._offer, item, monotonic())
+
+    async def put(self, item=CAPTURE) -> None:
+        """
+        Insere um item na fila, aguardando espaço livre.
+        """
+
+        if item in self._pending:
+            return
+        self._pending.add(item)
+        await self._queue.put((item, monotonic()))
+
+    async def _worker(self) -> None:
+        while True:
+            item, issued = await self._queue.get()
+            self._pending.discard(item)
+            new_command()
+            try:
+                text = item if item is not CAPTURE else await asyncio.to_thread(self.capture, issued)
+                if text:
+                    await asyncio.to_thread(self.handle, text, issued)
+            except Exception:
+                logger.exception('Falha ao processar comando')
+            finally:
+                self._queue.task_done()
+
+    async def run(self, *sources) -> None:
+        """
+        Executa as fontes de entrada até que todas terminem e a fila esteja vazia.
+
+        Parâmetros:
+        -----------
+        sources:
+            Funções assíncronas que recebem o Runtime e inserem itens na fila
+        """
+
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self.queue_size)
+        worker = asyncio.create_task(self._worker())
+        try:
+            await asyncio.gather(*(source(self) for source in sources))
+            await self._queue.join()
+        finally:
+            worker.cancel()
+
+
+# ─── Fontes De Entrada ────────────────────────────────────────────────────────
+
+
+def hotkey_source(hotkey, key: str = '='):
+    """
+    Captura um comando pelo microfone a cada pressionamento do atalho.
+
+    Parâmetros:
+    -----------
+    hotkey: KeyboardHotkey | EvdevHotkey | NullHotkey
+        Implementação do atalho (ver backends.py)
+    key: str
+        Tecla do atalho
+    """
+
+    async def source(runtime: Runtime) -> None:
+        unsubscribe = hotkey.subscribe(key, lambda: runtime.submit(CAPTURE))
+        try:
+            await asyncio.Event().wait()
+        finally:
+            unsubscribe()
+    return source
+
+
+async def stdin_source(runtime: Runtime) -> None:
+    """
+    Lê comandos já transcritos do terminal, um por linha.
+    """
+
+    while line := await asyncio.to_thread(sys.stdin.readline):
+        if line.strip():
+            await runtime.put(line.strip().lower())
+
+
+def text_source(texts: list):
+    """
+    Fornece uma lista fixa de comandos (ex.: testes e benchmarks).
+    """
+
+    async def source(runtime: Runtime) -> None:
+        for text in texts:
+            await runtime.put(text)
+    return source
+
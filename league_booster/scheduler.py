@@ -0,0 +1,145 @@
+import heapq
+import threading
+from contextvars import copy_context
+from time import monotonic
+
+from loguru import logger
+from tracing import record
+
+
+def cooldown(base: float, haste: float = 0) -> float:
+    """
+    Tempo de recarga de uma spell com aceleração de feitiços de invocador
+    (ex.: Percepção Cósmica: 18, Botas Ionianas da Lucidez: 12).
+    """
+
+    return base * 100 / (100 + haste)
+
+
+class Scheduler:
+    """
+    Agendador de notificações: uma fila de prioridade (heap) de timers,
+    processada por uma única thread, com uma única saída de voz reutilizada.
+
+    Cada timer é identificado por uma chave (ex.: ("flash", "top")). Agendar
+    uma chave já existente reinicia o timer, e timers cancelados ou
+    substituídos são descartados quando chegam ao topo da fila.
+
+    Ao vencer, o timer pode ser conferido por uma função (ex.: relógio da
+    partida): se ainda faltar tempo, o timer é reagendado em vez de notificado.
+
+    Parâmetros:
+    -----------
+    voice: callable
+        Função que cria a saída de voz, chamada uma única vez na thread do
+        agendador. Deve retornar uma função que recebe o texto a ser falado.
+    """
+
+    def __init__(self, voice) -> None:
+        self.voice = voice
+        self._heap = []
+        self._timers = {}
+        self._sequence = 0
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def schedule(self, key: tuple, delay: float, message: str, check=None) -> None:
+        """
+        Agenda (ou reinicia) um timer.
+
+        Parâmetros:
+        -----------
+        key: tuple
+            Identificador do timer
+        delay: float
+            Tempo, em segundos, até a notificação
+        message: str
+            Texto falado na notificação
+        check: callable | None
+            Função chamada ao vencer o timer, que retorna os segundos que ainda
+            faltam para a notificação (valores positivos reagendam o timer)
+        """
+
+        with self._condition:
+            self._sequence += 1
+            due = monotonic() + delay
+            self._timers[key] = (due, self._sequence, message, check, copy_context())
+            heapq.heappush(self._heap, (due, self._sequence, key))
+            self._condition.notify()
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='scheduler', daemon=True)
+                self._thread.start()
+
+    def cancel(self, key: tuple) -> bool:
+        """
+        Cancela um timer. Retorna False se o timer não existir.
+        """
+
+        with self._condition:
+            return self._timers.pop(key, None) is not None
+
+    def active(self) -> list:
+        """
+        Lista os timers ativos.
+
+        Retorna:
+        --------
+        list:
+            Lista de (chave, segundos restantes), em ordem de notificação
+        """
+
+        now = monotonic()
+        with self._condition:
+            timers = sorted(self._timers.items(), key=lambda item: item[1][0])
+        return [(key, max(due - now, 0)) for key, (due, *_) in timers]
+
+    def _next(self) -> tuple:
+        """
+        Aguarda o próximo timer vencer.
+
+        Retorna:
+        --------
+        tuple:
+            Chave, instante previsto, mensagem, função de conferência e contexto do timer
+        """
+
+        with self._condition:
+            while True:
+                # Descartando timers cancelados ou reiniciados
+                while self._heap and self._timers.get(self._heap[0][2], (None, None))[1] != self._heap[0][1]:
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                due, _, key = self._heap[0]
+                remaining = due - monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+
+                heapq.heappop(self._heap)
+                due, _, message, check, context = self._timers.pop(key)
+                return key, due, message, check, context
+
+    def _run(self) -> None:
+        speak = self.voice()
+        while True:
+            key, due, message, check, context = self._next()
+            context.run(self._notify, key, due, message, check, speak)
+
+    def _notify(self, key: tuple, due: float, message: str, check, speak) -> None:
+        # Correção pelo relógio de referência (ex.: partida pausada)
+        remaining = check() if check is not None else None
+        if remaining is not None and remaining > 0.25:
+            self.schedule(key, remaining, message, check)
+            return
+
+        lateness = monotonic() - due
+        record('notify', lateness)
+        logger.info(f'{message} (atraso do agendador: {lateness*1e3:.0f} ms)')
+        try:
+            speak(message)
+        except Exception:
+            logger.exception('Falha ao reproduzir notificação')
@@ -0,0 +1,91 @@
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+from resolver import phonetic_key, similarity
+
+# Métricas de semelhança disponíveis
+METRICS = ('sequence', 'edit', 'phonetic', 'ngram')
+
+# Scores já calculados, por métrica e par de nomes
+_memo = {metric: {} for metric in METRICS}
+
+
+def _pair_score(a: str, b: str, metric: str) -> float:
+    if metric == 'sequence':
+        return SequenceMatcher(None, a, b).ratio()
+    if metric == 'edit':
+        return similarity(a, b)
+    return similarity(phonetic_key(a), phonetic_key(b))
+
+
+def _ngram_scores(left: list, right: list) -> np.ndarray:
+    """
+    Similaridade de cosseno entre os n-gramas de caracteres (2 e 3) de cada par.
+    """
+
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.preprocessing import normalize
+
+    vectorizer = CountVectorizer(analyzer='char_wb', ngram_range=(2, 3))
+    try:
+        vectorizer.fit(left + right)
+    except ValueError:
+        # Nenhum n-grama (ex.: apenas nomes vazios): nenhuma semelhança
+        return np.zeros(len(left))
+    a = normalize(vectorizer.transform(left))
+    b = normalize(vectorizer.transform(right))
+    return np.asarray(a.multiply(b).sum(axis=1)).ravel()
+
+
+def score_pairs(left, right, metric: str = 'sequence') -> np.ndarray:
+    """
+    Calcula a semelhança entre pares de nomes, coluna a coluna.
+
+    Cada par distinto é pontuado uma única vez (os mesmos pares se repetem
+    entre roles e comandos) e os resultados são mantidos em memória entre
+    chamadas.
+
+    Parâmetros:
+    ----------
+    left: Sequence[str]
+        Nomes fornecidos pelo usuário
+    right: Sequence[str]
+        Nomes esperados
+    metric: str
+        'sequence' (difflib, métrica original), 'edit' (Levenshtein),
+        'phonetic' (Levenshtein entre chaves fonéticas) ou 'ngram'
+        (cosseno entre n-gramas de caracteres)
+
+    Retorna:
+    -------
+    np.ndarray:
+        Scores de 0 a 1, alinhados com os pares fornecidos
+    """
+
+    if metric not in METRICS:
+        raise ValueError(f'Métrica "{metric}" desconhecida. Opções: {", ".join(METRICS)}')
+
+    left = pd.Series(left, dtype=object).fillna('').astype(str).reset_index(drop=True)
+    right = pd.Series(right, dtype=object).fillna('').astype(str).reset_index(drop=True)
+    if len(left) == 0:
+        return np.zeros(0)
+
+    # Pares distintos
+    codes, uniques = pd.factorize(left + '\0' + right)
+    pairs = [pair.split('\0', 1) for pair in uniques]
+
+    memo = _memo[metric]
+    missing = [n for n, (a, b) in enumerate(pairs) if (a, b) not in memo]
+    if missing:
+        if metric == 'ngram':
+            scores = _ngram_scores([pairs[n][0] for n in missing],
+                                   [pairs[n][1] for n in missing])
+        else:
+            scores = [_pair_score(*pairs[n], metric) for n in missing]
+        for n, score in zip(missing, scores):
+            memo[tuple(pairs[n])] = float(score)
+
+    unique_scores = np.fromiter((memo[tuple(pair)] for pair in pairs),
+                                dtype=np.float64, count=len(pairs))
+    return unique_scores[codes]
@@ -0,0 +1,124 @@
+import glob
+import json
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter, time
+from uuid import uuid4
+
+import numpy as np
+from loguru import logger
+
+# Identificador do comando em execução, propagado entre threads pelo contexto
+command_id = ContextVar('command_id', default=None)
+
+
+def new_command() -> str:
+    """
+    Gera e ativa o identificador de um novo comando no contexto atual.
+    """
+
+    identifier = uuid4().hex[:8]
+    command_id.set(identifier)
+    return identifier
+
+
+def record(stage: str, seconds: float, **fields) -> None:
+    """
+    Registra a duração de uma etapa no log estruturado (JSON lines).
+
+    Parâmetros:
+    -----------
+    stage: str
+        Nome da etapa
+    seconds: float
+        Duração da etapa
+    fields:
+        Informações adicionais da etapa
+    """
+
+    payload = {'time': round(time(), 3), 'command': command_id.get(),
+               'stage': stage, 'ms': round(seconds * 1e3, 3), **fields}
+    logger.bind(span=stage, json=json.dumps(payload, ensure_ascii=False)).trace(stage)
+
+
+@contextmanager
+def span(stage: str, **fields):
+    """
+    Mede a duração de um bloco de código (ex.: `with span('fetch'): ...`).
+    """
+
+    start = perf_counter()
+    try:
+        yield fields
+    finally:
+        record(stage, perf_counter() - start, **fields)
+
+
+# ─── Resumo ───────────────────────────────────────────────────────────────────
+
+
+def percentiles(entries) -> dict:
+    """
+    Percentis da duração de cada etapa.
+
+    Parâmetros:
+    -----------
+    entries: Iterable[dict]
+        Registros de etapas (ver record)
+
+    Retorna:
+    --------
+    dict:
+        Etapa -> quantidade de registros e percentis 50, 95 e 99 (ms)
+    """
+
+    durations = {}
+    for entry in entries:
+        durations.setdefault(entry['stage'], []).append(entry['ms'])
+
+    summary = {}
+    for stage, values in sorted(durations.items()):
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        summary[stage] = {'count': len(values), 'p50': p50, 'p95': p95, 'p99': p99}
+    return summary
+
+
+def read_entries(paths: list):
+    """
+    Lê os registros de etapas de arquivos de log (JSON lines).
+    """
+
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def summarize(paths: list) -> dict:
+    """
+    Percentis da duração de cada etapa nos logs estruturados.
+
+    Parâmetros:
+    -----------
+    paths: list
+        Arquivos de log (JSON lines)
+
+    Retorna:
+    --------
+    dict:
+        Etapa -> quantidade de registros e percentis 50, 95 e 99 (ms)
+    """
+
+    return percentiles(read_entries(paths))
+
+
+if __name__ == '__main__':
+    # Uso: python tracing.py [padrão dos arquivos], por padrão todos os logs
+    pattern = sys.argv[1] if len(sys.argv) > 1 else 'logs/**/*.jsonl'
+    paths = glob.glob(pattern, recursive=True)
+    print(f'{len(paths)} arquivo(s) de log')
+    print(f'{"etapa":<12} {"n":>6} {"p50 (ms)":>10} {"p95 (ms)":>10} {"p99 (ms)":>10}')
+    for stage, stats in summarize(paths).items():
+        print(f'{stage:<12} {stats["count"]:>6} {stats["p50"]:>10.1f} {stats["p95"]:>10.1f} {stats["p99"]:>10.1f}')
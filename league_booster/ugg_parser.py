@@ -0,0 +1,90 @@
+import json
+from typing import NamedTuple
+
+# Marcador do script que contém o estado pré-carregado da página
+SCRIPT_MARKER = 'id="reactn-preloaded-state"'
+
+_decoder = json.JSONDecoder()
+
+
+class Matchup(NamedTuple):
+    """
+    Confronto de um campeão contra o campeão consultado.
+    """
+
+    champion_id: str
+    win_rate: float
+
+
+def find_script(html: str) -> tuple:
+    """
+    Localiza o script de estado pré-carregado sem construir a árvore DOM.
+
+    Parâmetros:
+    -----------
+    html: str
+        Conteúdo da página
+
+    Retorna:
+    --------
+    (int, int):
+        Posições de início e fim do conteúdo do script
+    """
+
+    marker = html.find(SCRIPT_MARKER)
+    if marker == -1:
+        raise ValueError('Script "reactn-preloaded-state" não encontrado na página.')
+    start = html.index('>', marker) + 1
+    end = html.find('</script>', start)
+    if end == -1:
+        raise ValueError('Script "reactn-preloaded-state" incompleto na página.')
+    return start, end
+
+
+def parse_counters(html: str, role: str) -> list:
+    """
+    Extrai os confrontos de uma role diretamente do estado pré-carregado da página.
+
+    Apenas a lista de counters da role é decodificada: as buscas são feitas
+    por posição no texto original, sem cópias intermediárias.
+
+    Parâmetros:
+    -----------
+    html: str
+        Conteúdo da página de counters do u.gg
+    role: str
+        Nome da role
+
+    Retorna:
+    --------
+    list[Matchup]:
+        Confrontos da role, na ordem da página
+    """
+
+    start, end = find_script(html)
+
+    # Formatando
+    role = role.replace('support', 'supp')
+
+    # Localizando a lista de counters da role
+    key = html.find(f'platinum_plus_{role}', start, end)
+    if key == -1:
+        raise ValueError(f'Dados de "platinum_plus_{role}" não encontrados.')
+    key = html.find('"counters"', key, end)
+    if key == -1:
+        raise ValueError(f'Counters de "platinum_plus_{role}" não encontrados.')
+    bracket = html.find('[', key, end)
+    if bracket == -1:
+        raise ValueError(f'Counters de "platinum_plus_{role}" em formato inesperado.')
+
+    entries, _ = _decoder.raw_decode(html, bracket)
+
+    matchups = []
+    for entry in entries:
+        # Mudanças no formato da página devem falhar, e não gerar dados incorretos
+        missing = [key for key in ('champion_id', 'win_rate') if key not in entry]
+        if missing:
+            raise ValueError(f'Counters de "platinum_plus_{role}" sem os campos: {", ".join(missing)}.')
+        matchups.append(Matchup(str(entry['champion_id']), float(entry['win_rate'])))
+
+    return matchups
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos do projeto são importados pelo nome (ex.: import draft_commands)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'league_booster'))
+
+
+@pytest.fixture(autouse=True)
+def project_root(monkeypatch):
+    """
+    Os arquivos de dados são relativos à pasta raiz do projeto.
+    """
+
+    monkeypatch.chdir(ROOT)
+
+
+@pytest.fixture
+def ugg_server():
+    """
+    Servidor HTTP local no lugar do u.gg (ver benchmark.start_fixture_server).
+    """
+
+    from benchmark import start_fixture_server
+
+    server = start_fixture_server()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
@@ -0,0 +1,62 @@
+import threading
+from time import monotonic, sleep
+
+import numpy as np
+import pytest
+import speech_recognition as sr
+
+
+def tone_frame(amplitude: int) -> bytes:
+    from capture import FRAME_SAMPLES
+    from recognizer import SAMPLE_RATE
+
+    t = np.arange(FRAME_SAMPLES) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 880 * t) * amplitude).astype(np.int16).tobytes()
+
+
+@pytest.fixture
+def cue_stream():
+    """
+    Microfone simulado em tempo real: silêncio, som de aviso captado pelo
+    microfone (logo após o atalho) e silêncio.
+
+    Retorna a captura, o instante do atalho e o intervalo do som de aviso.
+    """
+
+    from capture import FRAME_SECONDS, CaptureStream
+
+    frames = [tone_frame(0)] * 5 + [tone_frame(8000)] * 12 + [tone_frame(0)] * 30
+    window = {}
+    played = threading.Event()
+
+    def read() -> bytes:
+        sleep(FRAME_SECONDS)
+        if not frames:
+            return b''
+        n = 47 - len(frames)
+        if n == 5:
+            window['start'] = monotonic()
+        if n == 17:
+            window['end'] = monotonic()
+            played.set()
+        return frames.pop(0)
+
+    stream = CaptureStream(read, pre_roll=0.3).start()
+    played.wait(5)
+    return stream, window['start'] - 0.05, (window['start'], window['end'])
+
+
+def test_cue_is_captured_without_mute(cue_stream):
+    from capture import VoiceDetector
+
+    stream, issued, _ = cue_stream
+    captured = list(stream.frames(issued, timeout=0.6))
+    assert any(VoiceDetector.energy(frame) > 1000 for frame in captured)
+
+
+def test_frames_skip_cue(cue_stream):
+    stream, issued, mute = cue_stream
+    # Sem o som de aviso, resta apenas silêncio
+    with pytest.raises(sr.WaitTimeoutError):
+        list(stream.frames(issued, timeout=0.6, mute=mute))
+    assert 'speech_start' not in stream.timings
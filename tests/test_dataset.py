@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """
+    Banco de dados vazio em uma pasta temporária (backups inclusive).
+    """
+
+    from dataset import DatasetStore
+
+    monkeypatch.chdir(tmp_path)
+    return DatasetStore('assets/model/dataset', 'assets/model/model_data.feather')
+
+
+PAIRS = [('counters ari mid', 'counters ahri mid'),
+         ('counters zed top', 'counters zed top'),
+         ('draft jinx adc', 'draft jinx adc')]
+
+
+def test_ingest_skips_duplicates_and_exports(store):
+    from dataset import DatasetStore, ingest
+
+    assert ingest(PAIRS, store) == 3
+    assert ingest(PAIRS[:2] + [('counters lux support', 'counters lux support')], store) == 1
+
+    exported = pd.read_feather(store.seed)
+    assert exported['input'].tolist() == store.read()['input'].tolist()
+    assert len(store.partitions()) == 2
+
+    # Um clone novo reconstrói o mesmo banco de dados a partir do arquivo versionado
+    clone = DatasetStore('assets/model/clone', store.seed)
+    assert clone.fingerprint() == store.fingerprint()
+
+
+def test_rewrite_backs_up_and_replaces(store):
+    from dataset import ingest
+
+    ingest(PAIRS, store)
+    store.rewrite(store.read().iloc[1:].reset_index(drop=True))
+
+    assert store.read()['input'].tolist() == [pair[0] for pair in PAIRS[1:]]
+    assert len(pd.read_feather(store.seed)) == 2
+    backups = [os.path.join(folder, 'model_data.feather')
+               for folder in os.scandir('assets/backups')]
+    assert len(pd.read_feather(backups[0])) == 3
+    assert not os.path.exists(f'{store.root}.new') and not os.path.exists(f'{store.root}.old')
@@ -0,0 +1,51 @@
+import pytest
+
+
+@pytest.fixture
+def ugg(ugg_server, tmp_path, monkeypatch):
+    """
+    Counters obtidos do servidor local, com cache temporário e sem matriz de confrontos.
+    """
+
+    import draft_commands
+    from cache import CountersCache
+
+    monkeypatch.setattr(draft_commands, 'UGG_URL', ugg_server)
+    monkeypatch.setattr(draft_commands, 'cache', CountersCache(str(tmp_path / 'counters.db')))
+    monkeypatch.setattr(draft_commands, 'load_matchups', lambda database: None)
+    return ugg_server
+
+
+def test_counters_accepts_compound_names(ugg):
+    from draft_commands import counters, fetch_counters
+
+    assert counters('lee sin', 'jungle') == fetch_counters('lee sin', 'jungle', base_url=ugg)
+
+
+def test_draft_uses_counters_of_champion(ugg):
+    from draft_commands import counters, draft, draft_options, load_duo_index
+
+    expected = draft_options(counters('ahri', 'mid'), 'mid', load_duo_index())
+    assert draft('ahri', 'mid') == expected
+
+
+def test_counters_batch_keeps_command_id(ugg):
+    import json
+
+    from draft_commands import counters_batch
+    from loguru import logger
+    from tracing import command_id, new_command
+
+    entries = []
+    sink = logger.add(lambda message: entries.append(json.loads(message.record['extra']['json'])),
+                      level='TRACE', filter=lambda record: 'span' in record['extra'])
+    try:
+        identifier = new_command()
+        counters_batch([('ahri', 'mid'), ('zed', 'top'), ('jinx', 'adc')])
+    finally:
+        logger.remove(sink)
+        command_id.set(None)
+
+    stages = {entry['stage'] for entry in entries}
+    assert {'lookup', 'fetch', 'parse'} <= stages
+    assert {entry['command'] for entry in entries} == {identifier}
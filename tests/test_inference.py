@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope='module')
+def trained():
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.model_selection import train_test_split
+    from sklearn.tree import DecisionTreeClassifier
+
+    data = pd.read_feather('assets/model/model_data.feather').sample(3000, random_state=10)
+    train, test = train_test_split(data, test_size=0.3, random_state=10)
+    vectorizer = CountVectorizer(max_features=1000, stop_words=[''])
+    model = DecisionTreeClassifier(random_state=10)
+    model.fit(vectorizer.fit_transform(train['input']), train['output'])
+    texts = test['input'].tolist() + ['', 'counters', 'palavra desconhecida']
+    return model, vectorizer, texts
+
+
+def test_sparse_walk_matches_sklearn(trained):
+    from inference import Classifier
+
+    model, vectorizer, texts = trained
+    classifier = Classifier.from_sklearn(model, vectorizer)
+
+    expected = model.predict(vectorizer.transform(texts)).tolist()
+    assert classifier.predict_batch(texts) == expected
+    assert [classifier.predict(text) for text in texts[:50]] == expected[:50]
+
+
+def test_compact_model_roundtrip(trained, tmp_path):
+    from inference import export_compact, load_compact
+
+    model, vectorizer, texts = trained
+    path = str(tmp_path / 'model.npz')
+    export_compact(model, vectorizer, path)
+
+    assert load_compact(path).predict_batch(texts) == model.predict(vectorizer.transform(texts)).tolist()
@@ -0,0 +1,121 @@
+import glob
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def database():
+    return {'region': 'br1', 'patch': '13_7',
+            'champions': ['ahri', 'zed', 'jinx', 'thresh'], 'roles': ['top', 'mid', 'adc']}
+
+
+@pytest.fixture
+def built(ugg_server, database, tmp_path, monkeypatch):
+    """
+    Matriz de confrontos construída a partir das páginas do servidor local.
+    """
+
+    import draft_commands
+    import prefetch
+    from cache import CountersCache
+    from matchups import read_matchups
+
+    cache = CountersCache(str(tmp_path / 'counters.db'))
+    monkeypatch.setattr(draft_commands, 'UGG_URL', ugg_server)
+    monkeypatch.setattr(draft_commands, 'cache', cache)
+    monkeypatch.setattr(prefetch, 'cache', cache)
+
+    path = str(tmp_path / 'matchups.json')
+    draft_commands.gather_matchups(workers=4, rate=1000, path=path, database=database)
+    return read_matchups(path), path
+
+
+def test_matrix_matches_fetch_counters(ugg_server, database, built):
+    from draft_commands import fetch_counters
+
+    matrix, _ = built
+    assert matrix.deltas.shape == (4, len(matrix.options), 3)
+    for champion in database['champions']:
+        for role in database['roles']:
+            expected = fetch_counters(champion, role, base_url=ugg_server)
+            assert matrix.covers(champion, role)
+            result = matrix.counters(champion, role)
+            assert result.keys() == expected.keys()
+            assert max(abs(result[option] - expected[option]) for option in expected) < 0.01
+
+
+def test_matrix_scores_and_coverage(built):
+    matrix, _ = built
+    enemies = [('ahri', 'mid'), ('jinx', 'adc')]
+    scores = matrix.scores(enemies)
+
+    assert scores.shape == (len(matrix.options), 2)
+    for j, enemy in enumerate(enemies):
+        column = dict(zip(matrix.options, scores[:, j]))
+        assert {option: score for option, score in column.items() if not np.isnan(score)} == \
+            matrix.counters(*enemy)
+    assert not matrix.covers('ahri', 'support')
+    assert not matrix.covers('unknown', 'mid')
+
+
+def test_counters_batch_matches_scrape_path(built, database, monkeypatch):
+    import draft_commands
+
+    matrix, _ = built
+    enemies = [('ahri', 'mid'), ('zed', 'top'), ('jinx', 'adc')]
+    get = draft_commands.registry.get
+    monkeypatch.setattr(draft_commands.registry, 'get',
+                        lambda name: database if name == 'database' else get(name))
+
+    monkeypatch.setattr(draft_commands, 'load_matchups', lambda database: matrix)
+    results, ranking = draft_commands.counters_batch(enemies)
+    monkeypatch.setattr(draft_commands, 'load_matchups', lambda database: None)
+    expected_results, expected_ranking = draft_commands.counters_batch(enemies)
+
+    assert [result.keys() for result in results] == [result.keys() for result in expected_results]
+    assert [option for _, option, _ in ranking] == [option for _, option, _ in expected_ranking]
+
+
+def test_rebuild_while_mapped(built, database):
+    import draft_commands
+    from matchups import read_matchups
+
+    matrix, path = built
+    draft_commands.gather_matchups(workers=4, rate=1000, path=path, database=database)
+    rebuilt = read_matchups(path)
+
+    assert np.array_equal(np.asarray(matrix.deltas), np.asarray(rebuilt.deltas), equal_nan=True)
+    assert len(glob.glob(path.replace('.json', '.*.npy'))) == 1
+
+
+def test_load_matchups_ignores_unreadable_file(tmp_path, database, monkeypatch):
+    import draft_commands
+    from matchups import read_matchups
+    from registry import AssetRegistry
+
+    path = tmp_path / 'matchups.json'
+    registry = AssetRegistry()
+    registry.register('matchups', str(path), read_matchups)
+    monkeypatch.setattr(draft_commands, 'registry', registry)
+
+    assert draft_commands.load_matchups(database) is None
+    path.write_text('{"region": "br1", "pat')
+    registry.check_interval = 0
+    assert draft_commands.load_matchups(database) is None
+
+
+def test_registry_remembers_missing_file(tmp_path, monkeypatch):
+    import registry as module
+    from registry import AssetRegistry
+
+    registry = AssetRegistry(check_interval=60)
+    registry.register('missing', str(tmp_path / 'missing.json'), lambda path: None)
+
+    calls = []
+    getmtime = module.os.path.getmtime
+    monkeypatch.setattr(module.os.path, 'getmtime', lambda path: calls.append(path) or getmtime(path))
+    for _ in range(3):
+        with pytest.raises(FileNotFoundError):
+            registry.get('missing')
+    assert len(calls) == 1
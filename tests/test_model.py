@@ -0,0 +1,58 @@
+import os
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """
+    Pasta de trabalho temporária com uma amostra do banco de dados do modelo como semente.
+    """
+
+    data = pd.read_feather('assets/model/model_data.feather').sample(400, random_state=10)
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('assets/model')
+    data.reset_index(drop=True).to_feather('assets/model/model_data.feather')
+    return tmp_path
+
+
+def test_incremental_vectorization(workspace):
+    from dataset import DatasetStore, ingest
+    from model import train_model, vectorize
+
+    # Vetorização completa
+    x, y, vectorizer, new_rows = vectorize(DatasetStore(), incremental=True)
+    assert new_rows == x.shape[0] == len(y) == 400
+    assert os.path.exists('assets/model/features.npz')
+
+    # Banco de dados inalterado: a vetorização anterior é reaproveitada
+    model, reused = train_model(test_size=0, incremental=True)
+    x_again, _, _, new_rows = vectorize(DatasetStore(), incremental=True)
+    assert new_rows == 0
+    assert (x_again != x).nnz == 0
+    assert reused.vocabulary_ == vectorizer.vocabulary_
+
+    # Entradas novas: apenas elas são vetorizadas, sem alterar as anteriores
+    ingest([('counters aatrox palavranova top', 'counters aatrox top'),
+            ('draft ahri mid', 'draft ahri mid')])
+    x_new, y_new, vectorizer_new, new_rows = vectorize(DatasetStore(), incremental=True)
+    assert new_rows == 2
+    assert x_new.shape[0] == 402 and list(y_new[-2:]) == ['counters aatrox top', 'draft ahri mid']
+    assert (x_new[:400, :x.shape[1]] != x).nnz == 0
+    assert 'palavranova' in vectorizer_new.vocabulary_
+    assert (x_new[400:] != vectorizer_new.transform(['counters aatrox palavranova top',
+                                                     'draft ahri mid'])).nnz == 0
+
+
+def test_rewrite_forces_full_vectorization(workspace):
+    from dataset import DatasetStore
+    from model import vectorize
+
+    vectorize(DatasetStore(), incremental=True)
+    store = DatasetStore()
+    store.rewrite(store.read().iloc[::-1].reset_index(drop=True))
+
+    x, y, vectorizer, new_rows = vectorize(DatasetStore(), incremental=True)
+    assert new_rows == 400
+    assert (x != vectorizer.transform(DatasetStore().read()['input'])).nnz == 0
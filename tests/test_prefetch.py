@@ -0,0 +1,62 @@
+from time import monotonic
+
+import pytest
+
+
+@pytest.fixture
+def database():
+    return {'region': 'br1', 'patch': '13_7',
+            'champions': ['ahri', 'zed', 'jinx'], 'roles': ['mid', 'adc']}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    import prefetch
+    from cache import CountersCache
+
+    cache = CountersCache(str(tmp_path / 'counters.db'))
+    monkeypatch.setattr(prefetch, 'cache', cache)
+    return cache
+
+
+def test_rate_limiter_spaces_requests():
+    from prefetch import RateLimiter
+
+    limiter = RateLimiter(rate=50)
+    start = monotonic()
+    for _ in range(11):
+        limiter.wait()
+    assert monotonic() - start >= 10 / 50 * 0.9
+
+
+def test_prefetch_fills_cache(ugg_server, database, cache):
+    from draft_commands import fetch_counters
+    from prefetch import prefetch
+
+    summary = prefetch(database, workers=2, rate=100, base_url=ugg_server)
+
+    assert (summary['fetched'], summary['failed'], summary['skipped']) == (6, 0, 0)
+    for champion in database['champions']:
+        for role in database['roles']:
+            assert cache.get(champion, role, 'br1', '13_7') == \
+                fetch_counters(champion, role, base_url=ugg_server)
+
+
+def test_prefetch_respects_rate(ugg_server, database, cache):
+    from prefetch import prefetch
+
+    start = monotonic()
+    prefetch(database, workers=4, rate=20, base_url=ugg_server)
+    assert monotonic() - start >= 5 / 20 * 0.9
+
+
+def test_prefetch_resumes(ugg_server, database, cache):
+    from prefetch import prefetch
+
+    cache.set('ahri', 'mid', 'br1', '13_7', {'Zed': 1.0})
+    summary = prefetch(database, workers=2, rate=100, base_url=ugg_server)
+    assert (summary['fetched'], summary['skipped']) == (5, 1)
+    assert cache.get('ahri', 'mid', 'br1', '13_7') == {'Zed': 1.0}
+
+    summary = prefetch(database, workers=2, rate=100, base_url=ugg_server)
+    assert (summary['fetched'], summary['skipped']) == (0, 6)
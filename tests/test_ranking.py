@@ -0,0 +1,21 @@
+import numpy as np
+
+
+def test_rank_array_matches_rank_with_ties():
+    from ranking import rank, rank_array
+
+    rng = np.random.default_rng(10)
+    options = [f'option_{n:03d}' for n in range(200)]
+    for _ in range(50):
+        scores = rng.integers(0, 5, len(options)).astype(float)
+        for k in (1, 3, 10, 50, None):
+            expected = rank(dict(zip(options, scores)), k)
+            assert rank_array(options, scores, k) == expected
+
+
+def test_rank_array_priority_precedes_score():
+    from ranking import rank_array
+
+    ranking = rank_array(['a', 'b', 'c', 'd'], np.array([5.0, 1.0, 1.0, 9.0]), 2,
+                         priority=np.array([1, 2, 2, 0]))
+    assert [option for _, option, _ in ranking] == ['b', 'c']
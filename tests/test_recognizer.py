@@ -0,0 +1,99 @@
+import os
+import wave
+
+import numpy as np
+import pytest
+import speech_recognition as sr
+
+
+@pytest.fixture
+def wav_path(tmp_path):
+    """
+    Gravação de 1 s (PCM 16 kHz, 16 bits, mono): 0,5 s de silêncio e 0,5 s de tom.
+    """
+
+    from recognizer import SAMPLE_RATE, SAMPLE_WIDTH
+
+    t = np.arange(SAMPLE_RATE // 2) / SAMPLE_RATE
+    tone = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+    samples = np.concatenate([np.zeros(SAMPLE_RATE // 2, dtype=np.int16), tone])
+
+    path = str(tmp_path / 'command.wav')
+    with wave.open(path, 'wb') as file:
+        file.setnchannels(1)
+        file.setsampwidth(SAMPLE_WIDTH)
+        file.setframerate(SAMPLE_RATE)
+        file.writeframes(samples.tobytes())
+    return path
+
+
+class ScriptedRecognizer:
+    """
+    Reconhecedor que emite hipóteses pré-definidas, uma a cada bloco de áudio.
+    """
+
+    streaming = True
+
+    def __init__(self, hypotheses: list) -> None:
+        self.hypotheses = hypotheses
+        self.consumed = 0
+
+    def stream(self, frames):
+        for frame, hypothesis in zip(frames, self.hypotheses):
+            self.consumed += 1
+            yield hypothesis
+
+
+def test_wav_frames_reads_whole_file(wav_path):
+    from recognizer import SAMPLE_RATE, SAMPLE_WIDTH, wav_frames
+
+    frames = list(wav_frames(wav_path, chunk=4000))
+    assert [len(frame) for frame in frames] == [4000 * SAMPLE_WIDTH] * 4
+    assert len(b''.join(frames)) == SAMPLE_RATE * SAMPLE_WIDTH
+
+
+def test_transcribe_returns_final_result(wav_path):
+    from recognizer import transcribe, wav_frames
+
+    recognizer = ScriptedRecognizer([('counters', False), ('counters ahri', False),
+                                     ('counters ahri mid', True)])
+    assert transcribe(recognizer, wav_frames(wav_path)) == 'counters ahri mid'
+
+
+def test_transcribe_stops_when_command_is_complete(wav_path):
+    from recognizer import transcribe, wav_frames
+
+    recognizer = ScriptedRecognizer([('counters', False), ('counters ahri mid', False),
+                                     ('counters ahri mid top', True)])
+    text = transcribe(recognizer, wav_frames(wav_path, chunk=1000),
+                      done=lambda text: len(text.split()) == 3)
+    assert text == 'counters ahri mid'
+    assert recognizer.consumed == 2
+
+
+def test_transcribe_without_speech(wav_path):
+    from recognizer import transcribe, wav_frames
+
+    with pytest.raises(sr.UnknownValueError):
+        transcribe(ScriptedRecognizer([('', False), ('', True)]), wav_frames(wav_path))
+
+
+def test_google_recognizer_sends_whole_recording(wav_path):
+    from recognizer import GoogleRecognizer, SAMPLE_RATE, SAMPLE_WIDTH, transcribe, wav_frames
+
+    class Recognizer:
+        def recognize_google(self, audio, language):
+            assert len(audio.get_raw_data()) == SAMPLE_RATE * SAMPLE_WIDTH
+            return 'Counters Ahri Mid'
+
+    assert transcribe(GoogleRecognizer(Recognizer()), wav_frames(wav_path)) == 'counters ahri mid'
+
+
+@pytest.mark.skipif(not os.path.isdir(os.path.join(os.path.dirname(__file__), '..', 'assets', 'model', 'vosk')), reason='Modelo do Vosk não instalado')
+def test_vosk_recognizer_streams(wav_path):
+    from load import load_data
+    from recognizer import VoskRecognizer, wav_frames
+
+    recognizer = VoskRecognizer('assets/model/vosk', load_data())
+    results = list(recognizer.stream(wav_frames(wav_path)))
+    assert results and results[-1][1]
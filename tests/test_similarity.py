@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('metric', ['sequence', 'edit', 'phonetic', 'ngram'])
+def test_score_pairs_matches_pairwise(metric):
+    from similarity import score_pairs
+
+    left = ['ahri', 'zed', 'ahri', 'jinks', '']
+    right = ['ahri', 'zed', 'akali', 'jinx', 'ahri']
+    batch = score_pairs(left, right, metric)
+    single = [score_pairs([a], [b], metric)[0] for a, b in zip(left, right)]
+    assert np.allclose(batch, single)
+    assert batch[0] == pytest.approx(1.0)
+
+
+def test_ngram_scores_without_ngrams():
+    from similarity import _memo, score_pairs
+
+    _memo['ngram'].clear()
+    assert score_pairs(['', ''], ['', ' '], 'ngram').tolist() == [0.0, 0.0]